@@ -0,0 +1,4 @@
+from dotenv import load_dotenv
+
+# Load environment variables once, before any module reads its settings
+load_dotenv()
@@ -0,0 +1,126 @@
+import itertools
+import time
+from typing import Any, Dict, Generic, List, Optional, Sequence, TypeVar
+from sqlalchemy import exc
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool, QueuePool
+
+ROUTING_STRATEGIES = ("round_robin", "least_connections")
+
+E = TypeVar("E")
+
+
+class PoolMetrics:
+    """Connection checkout counters for one pool"""
+
+    def __init__(self):
+        self.checked_out = 0
+        self.acquisitions = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+
+    def record_wait(self, seconds: float) -> None:
+        self.acquisitions += 1
+        self.wait_total += seconds
+        self.wait_max = max(self.wait_max, seconds)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "checked_out": self.checked_out,
+            "acquisitions": self.acquisitions,
+            "timeouts": self.timeouts,
+            "wait_total_ms": round(self.wait_total * 1000, 3),
+            "wait_avg_ms": round(
+                self.wait_total * 1000 / self.acquisitions if self.acquisitions else 0,
+                3,
+            ),
+            "wait_max_ms": round(self.wait_max * 1000, 3),
+        }
+
+
+class TimedPoolMixin:
+    """Times how long each checkout waits for a connection.
+
+    The wait includes opening a new connection when the pool has none idle,
+    which is what a request actually pays.
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics = PoolMetrics()
+
+    def _do_get(self) -> Any:
+        start = time.perf_counter()
+        try:
+            connection = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.timeouts += 1
+            raise
+        finally:
+            self.metrics.record_wait(time.perf_counter() - start)
+        self.metrics.checked_out += 1
+        return connection
+
+    def _do_return_conn(self, record: Any) -> None:
+        self.metrics.checked_out -= 1
+        super()._do_return_conn(record)
+
+
+class TimedQueuePool(TimedPoolMixin, QueuePool):
+    pass
+
+
+class TimedAsyncQueuePool(TimedPoolMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+class TimedNullPool(TimedPoolMixin, NullPool):
+    pass
+
+
+def pool_stats(pool: Optional[Pool]) -> Optional[Dict[str, Any]]:
+    if pool is None:
+        return None
+    stats: Dict[str, Any] = {"pool": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            # Negative while the pool has not yet opened pool_size connections
+            overflow=max(pool.overflow(), 0),
+            max_overflow=pool._max_overflow,
+        )
+    metrics = getattr(pool, "metrics", None)
+    if metrics is not None:
+        stats.update(metrics.stats())
+    return stats
+
+
+class ReplicaRouter(Generic[E]):
+    """Picks the engine for the next read from a set of replicas.
+
+    ``least_connections`` compares the connections each engine's pool has
+    checked out, so a replica that is slow to answer gets fewer new reads.
+    """
+
+    def __init__(self, engines: Sequence[E], strategy: str = "round_robin"):
+        if not engines:
+            raise ValueError("ReplicaRouter needs at least one engine")
+        if strategy not in ROUTING_STRATEGIES:
+            raise ValueError(f"Unknown routing strategy: {strategy}")
+        self.engines: List[E] = list(engines)
+        self.strategy = strategy
+        self._next = itertools.cycle(range(len(self.engines)))
+
+    def choose(self) -> E:
+        if self.strategy == "least_connections":
+            # Ties go to the next engine in round-robin order
+            start = next(self._next)
+            order = self.engines[start:] + self.engines[:start]
+            return min(order, key=self._checked_out)
+        return self.engines[next(self._next)]
+
+    @staticmethod
+    def _checked_out(engine: Any) -> int:
+        metrics = getattr(engine.pool, "metrics", None)
+        return metrics.checked_out if metrics is not None else 0
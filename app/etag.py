@@ -0,0 +1,46 @@
+import hashlib
+from typing import Any, Optional
+from fastapi import HTTPException
+
+
+def make_etag(*parts: Any) -> str:
+    """Strong ETag derived from the given values (ids, row versions, ...)"""
+    digest = hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+    return f'"{digest}"'
+
+
+def author_etag(author: Any) -> str:
+    return make_etag("author", author.id, author.version)
+
+
+def book_etag(book: Any) -> str:
+    # The author is embedded in the representation, so its version counts too
+    return make_etag("book", book.id, book.version, book.author.version)
+
+
+def book_collection_etag(books: Any, *extra: Any) -> str:
+    return make_etag(
+        "books",
+        *extra,
+        *((book.id, book.version, book.author.version) for book in books),
+    )
+
+
+def author_collection_etag(authors: Any, *extra: Any) -> str:
+    return make_etag(
+        "authors", *extra, *((author.id, author.version) for author in authors)
+    )
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [tag.strip() for tag in if_none_match.split(",")]
+    # If-None-Match uses weak comparison
+    return "*" in tags or any(tag.removeprefix("W/") == etag for tag in tags)
+
+
+def raise_if_not_modified(if_none_match: Optional[str], etag: str) -> None:
+    """Answer with 304 before the representation is built or serialized"""
+    if etag_matches(if_none_match, etag):
+        raise HTTPException(status_code=304, headers={"ETag": etag})
@@ -0,0 +1,73 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, List, Optional, TypeVar
+
+K = TypeVar("K", bound=Hashable)
+V = TypeVar("V")
+
+
+class DataLoader(Generic[K, V]):
+    """Batches and memoizes lookups by key, scoped to whatever owns it.
+
+    Keys requested in the same event-loop tick are resolved together by one
+    call to ``batch_load``, which returns a mapping of the keys it found; keys
+    it did not find resolve to None. Each key is loaded at most once until it
+    is cleared.
+    """
+
+    def __init__(
+        self,
+        batch_load: Callable[[List[K]], Awaitable[Dict[K, V]]],
+        max_batch_size: int = 1000,
+    ):
+        self.batch_load = batch_load
+        self.max_batch_size = max_batch_size
+        self._futures: Dict[K, asyncio.Future] = {}
+        self._queue: List[K] = []
+        self.batches = 0
+
+    async def load(self, key: K) -> Optional[V]:
+        future = self._futures.get(key)
+        if future is None:
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            self._futures[key] = future
+            if not self._queue:
+                loop.call_soon(self._dispatch)
+            self._queue.append(key)
+        # A cancelled caller must not cancel the result for everyone else
+        return await asyncio.shield(future)
+
+    async def load_many(self, keys: List[K]) -> List[Optional[V]]:
+        return list(await asyncio.gather(*(self.load(key) for key in keys)))
+
+    def clear(self, key: K) -> None:
+        future = self._futures.get(key)
+        # Keys still being loaded stay put; their waiters need the result
+        if future is not None and future.done():
+            del self._futures[key]
+
+    def clear_all(self) -> None:
+        for key in [key for key, future in self._futures.items() if future.done()]:
+            del self._futures[key]
+
+    def _dispatch(self) -> None:
+        keys, self._queue = self._queue, []
+        asyncio.ensure_future(self._load_batches(keys))
+
+    async def _load_batches(self, keys: List[K]) -> None:
+        # Batches run one after another: they usually share a single session
+        for start in range(0, len(keys), self.max_batch_size):
+            batch = keys[start : start + self.max_batch_size]
+            self.batches += 1
+            try:
+                values = await self.batch_load(batch)
+            except Exception as exc:
+                for key in batch:
+                    # Failures are not memoized, so a later load retries
+                    future = self._futures.pop(key)
+                    future.set_exception(exc)
+                    # Mark retrieved in case every waiter was cancelled
+                    future.exception()
+                continue
+            for key in batch:
+                self._futures[key].set_result(values.get(key))
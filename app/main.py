@@ -1,61 +1,285 @@
-from fastapi import FastAPI, Depends
-from sqlalchemy.orm import Session
-from . import models
-from .database import engine, get_db
-from typing import List, AsyncGenerator
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, Depends, Header, Path, Query, Request, Response
+from fastapi.responses import PlainTextResponse, StreamingResponse
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+from .database import (
+    AsyncSessionLocal,
+    dispose_engines,
+    get_async_db,
+    get_async_engine,
+    get_async_read_db,
+    get_pool_stats,
+    get_read_router,
+)
+from .http_client import create_http_client
+from .cache import TTLCache
+from .shared_cache import ModelCodec, SharedCache, create_cache_backend
+from .etag import author_collection_etag, author_etag, book_collection_etag, book_etag
+from .resilience import CircuitBreaker, TokenBucket
+from .metrics import REGISTRY, render_gauge
+from .middleware import MetricsMiddleware
+from typing import Any, Dict, List, AsyncGenerator, Optional, Tuple, Union
 from .repositories.author_repository import AuthorRepository
 from .repositories.book_repository import BookRepository
 from .repositories.google_books_repository import GoogleBooksRepository, GoogleBook
+from .repositories.google_books_cache_repository import GoogleBooksCacheRepository
 from .services.author_service import AuthorService
 from .services.book_service import BookService
+from .services.enrichment_service import EnrichmentService
+from .services.book_export_service import BookExportService, EXPORT_MEDIA_TYPES
+from .services.book_import_service import (
+    BookImportService,
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
 from .schemas import (
     AuthorCreate,
     Author,
     BookCreate,
+    BookUpsert,
     Book,
+    BookSearchResult,
     PaginatedResponse,
+    CursorPaginatedResponse,
+    BookImportResult,
     GoogleBook as GoogleBookSchema,
 )
-from dotenv import load_dotenv
 import os
 
-# Load environment variables
-load_dotenv()
+# Google Books response cache settings
+GOOGLE_BOOKS_CACHE_SIZE = int(os.getenv("GOOGLE_BOOKS_CACHE_SIZE", "1024"))
+GOOGLE_BOOKS_CACHE_TTL = float(os.getenv("GOOGLE_BOOKS_CACHE_TTL", "300"))
+# How long past its TTL a result may still be served while Google is unavailable
+GOOGLE_BOOKS_CACHE_STALE_TTL = float(os.getenv("GOOGLE_BOOKS_CACHE_STALE_TTL", "3600"))
+# How long persisted ISBN metadata is used before it is fetched again
+GOOGLE_BOOKS_ISBN_CACHE_TTL = float(
+    os.getenv("GOOGLE_BOOKS_ISBN_CACHE_TTL", str(7 * 24 * 3600))
+)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Google Books client-side protection settings
+GOOGLE_BOOKS_RATE_LIMIT = float(os.getenv("GOOGLE_BOOKS_RATE_LIMIT", "10"))
+GOOGLE_BOOKS_RATE_BURST = float(os.getenv("GOOGLE_BOOKS_RATE_BURST", "20"))
+GOOGLE_BOOKS_DEADLINE = float(os.getenv("GOOGLE_BOOKS_DEADLINE", "8"))
+GOOGLE_BOOKS_MAX_RETRIES = int(os.getenv("GOOGLE_BOOKS_MAX_RETRIES", "2"))
+GOOGLE_BOOKS_BREAKER_THRESHOLD = int(os.getenv("GOOGLE_BOOKS_BREAKER_THRESHOLD", "5"))
+GOOGLE_BOOKS_BREAKER_RESET = float(os.getenv("GOOGLE_BOOKS_BREAKER_RESET", "30"))
 
-app = FastAPI(title="Library Management System")
+# Background Google Books enrichment settings
+ENRICHMENT_CONCURRENCY = int(os.getenv("ENRICHMENT_CONCURRENCY", "4"))
+ENRICHMENT_MAX_ATTEMPTS = int(os.getenv("ENRICHMENT_MAX_ATTEMPTS", "3"))
+ENRICHMENT_QUEUE_SIZE = int(os.getenv("ENRICHMENT_QUEUE_SIZE", "10000"))
 
+# Where shared caches live: memory (per worker) or redis (CACHE_URL), which
+# every worker shares, so a value loaded by one is a hit for all of them
+CACHE_BACKEND = os.getenv("CACHE_BACKEND", "memory").lower()
+CACHE_URL = os.getenv("CACHE_URL", "redis://localhost:6379/0")
+# Entries held by the memory backend
+CACHE_MEMORY_SIZE = int(os.getenv("CACHE_MEMORY_SIZE", "10000"))
+# Author/book cache in front of get_by_id; writes invalidate it. On by default
+# only with redis: with the memory backend other workers' writes would go
+# unseen (stale rows and ETags) for up to the TTL. 0 disables it
+ENTITY_CACHE_TTL = float(
+    os.getenv("ENTITY_CACHE_TTL", "30" if CACHE_BACKEND == "redis" else "0")
+)
+# Cached /books/ pages (never for count=exact), dropped on every book write.
+# Off (0) unless set
+BOOK_PAGE_CACHE_TTL = float(os.getenv("BOOK_PAGE_CACHE_TTL", "0"))
 
-# Dependency injection for repositories
-def get_author_repository(db: Session = Depends(get_db)) -> AuthorRepository:
-    return AuthorRepository(db)
+# How long a cached book count is served before it is recomputed
+BOOK_COUNT_CACHE_TTL = float(os.getenv("BOOK_COUNT_CACHE_TTL", "5"))
 
+# Rows per multi-row INSERT in bulk imports
+BOOK_IMPORT_BATCH_SIZE = int(os.getenv("BOOK_IMPORT_BATCH_SIZE", "1000"))
+# Rows fetched per server-side cursor round trip in GET /books/export
+BOOK_EXPORT_BATCH_SIZE = int(os.getenv("BOOK_EXPORT_BATCH_SIZE", "1000"))
+# Largest page GET /authors/ and GET /books/ will return
+MAX_PAGE_SIZE = int(os.getenv("MAX_PAGE_SIZE", "100"))
+# Most authors accepted by one POST /authors/batch
+AUTHOR_BATCH_MAX_SIZE = int(os.getenv("AUTHOR_BATCH_MAX_SIZE", "1000"))
 
-def get_book_repository(db: Session = Depends(get_db)) -> BookRepository:
-    return BookRepository(db)
+# Requests slower than this many seconds are logged with a per-phase time
+# breakdown; unset disables the log
+SLOW_REQUEST_THRESHOLD = (
+    float(os.environ["SLOW_REQUEST_THRESHOLD"])
+    if os.getenv("SLOW_REQUEST_THRESHOLD")
+    else None
+)
 
 
-async def get_google_books_repository() -> AsyncGenerator[GoogleBooksRepository, None]:
+@asynccontextmanager
+async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
+    # Engines are built here rather than at import; connections are opened on
+    # first use. The schema is managed with Alembic (alembic upgrade head)
+    get_async_engine()
+    get_read_router()
+    # One pooled client for the whole process so keep-alive connections are reused
+    app.state.http_client = create_http_client()
+    app.state.google_books_cache = TTLCache(
+        maxsize=GOOGLE_BOOKS_CACHE_SIZE,
+        ttl=GOOGLE_BOOKS_CACHE_TTL,
+        stale_ttl=GOOGLE_BOOKS_CACHE_STALE_TTL,
+    )
+    app.state.google_books_rate_limiter = TokenBucket(
+        rate=GOOGLE_BOOKS_RATE_LIMIT, capacity=GOOGLE_BOOKS_RATE_BURST
+    )
+    app.state.google_books_circuit_breaker = CircuitBreaker(
+        failure_threshold=GOOGLE_BOOKS_BREAKER_THRESHOLD,
+        reset_timeout=GOOGLE_BOOKS_BREAKER_RESET,
+    )
+    app.state.count_cache = TTLCache(maxsize=16, ttl=BOOK_COUNT_CACHE_TTL)
+    app.state.cache_backend = create_cache_backend(
+        CACHE_BACKEND, CACHE_URL, maxsize=CACHE_MEMORY_SIZE
+    )
+    app.state.author_cache = app.state.book_cache = app.state.book_page_cache = None
+    if ENTITY_CACHE_TTL > 0:
+        app.state.author_cache = SharedCache(
+            app.state.cache_backend, "authors", ModelCodec(Author), ENTITY_CACHE_TTL
+        )
+        app.state.book_cache = SharedCache(
+            app.state.cache_backend, "books", ModelCodec(Book), ENTITY_CACHE_TTL
+        )
+    if BOOK_PAGE_CACHE_TTL > 0:
+        app.state.book_page_cache = SharedCache(
+            app.state.cache_backend,
+            "book_pages",
+            ModelCodec(Tuple[List[Book], Optional[int], str]),
+            BOOK_PAGE_CACHE_TTL,
+            versioned=True,
+        )
+    # In memory the per-worker TTLCache above already plays this role
+    app.state.google_books_shared_cache = None
+    if CACHE_BACKEND != "memory":
+        app.state.google_books_shared_cache = SharedCache(
+            app.state.cache_backend,
+            "google_books",
+            ModelCodec(List[GoogleBook]),
+            GOOGLE_BOOKS_CACHE_TTL,
+        )
+
+    # Google Books access (and so enrichment) is skipped entirely when there is
+    # no API key to call Google with
+    app.state.google_books_repository = None
+    app.state.enrichment_service = None
     api_key = os.getenv("GOOGLE_BOOKS_API_KEY")
-    if not api_key:
-        raise ValueError("GOOGLE_BOOKS_API_KEY environment variable is not set")
-    repository = GoogleBooksRepository(api_key)
+    if api_key:
+        app.state.google_books_repository = GoogleBooksRepository(
+            api_key,
+            app.state.http_client,
+            app.state.google_books_cache,
+            rate_limiter=app.state.google_books_rate_limiter,
+            circuit_breaker=app.state.google_books_circuit_breaker,
+            deadline=GOOGLE_BOOKS_DEADLINE,
+            max_retries=GOOGLE_BOOKS_MAX_RETRIES,
+            isbn_cache=GoogleBooksCacheRepository(
+                AsyncSessionLocal, ttl=GOOGLE_BOOKS_ISBN_CACHE_TTL
+            ),
+            shared_cache=app.state.google_books_shared_cache,
+        )
+        app.state.enrichment_service = EnrichmentService(
+            app.state.google_books_repository,
+            AsyncSessionLocal,
+            concurrency=ENRICHMENT_CONCURRENCY,
+            max_attempts=ENRICHMENT_MAX_ATTEMPTS,
+            maxsize=ENRICHMENT_QUEUE_SIZE,
+            book_cache=app.state.book_cache,
+            page_cache=app.state.book_page_cache,
+        )
+        app.state.enrichment_service.start()
     try:
-        yield repository
+        yield
     finally:
-        await repository.close()
+        if app.state.enrichment_service is not None:
+            await app.state.enrichment_service.stop()
+        await app.state.http_client.aclose()
+        await app.state.cache_backend.close()
+        await dispose_engines()
+
+
+app = FastAPI(title="Library Management System", lifespan=lifespan)
+app.add_middleware(MetricsMiddleware, slow_request_threshold=SLOW_REQUEST_THRESHOLD)
+
+
+# Dependency injection for repositories
+async def get_read_db(
+    request: Request, db: AsyncSession = Depends(get_async_db)
+) -> AsyncGenerator[AsyncSession, None]:
+    # Only GET requests read from replicas; a write request's reads (checking
+    # the author before inserting a book, say) stay on the primary
+    if request.method not in ("GET", "HEAD") or get_read_router() is None:
+        yield db
+        return
+    async for session in get_async_read_db():
+        yield session
+
+
+def get_author_repository(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_read_db),
+) -> AuthorRepository:
+    return AuthorRepository(db, read_db, entity_cache=request.app.state.author_cache)
+
+
+def get_count_cache(request: Request) -> TTLCache:
+    return request.app.state.count_cache
+
+
+def get_book_repository(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    read_db: AsyncSession = Depends(get_read_db),
+    count_cache: TTLCache = Depends(get_count_cache),
+) -> BookRepository:
+    return BookRepository(
+        db,
+        count_cache,
+        read_db=read_db,
+        entity_cache=request.app.state.book_cache,
+        page_cache=request.app.state.book_page_cache,
+    )
+
+
+def get_http_client(request: Request) -> httpx.AsyncClient:
+    return request.app.state.http_client
+
+
+def get_google_books_cache(request: Request) -> TTLCache:
+    return request.app.state.google_books_cache
+
+
+def get_google_books_repository(request: Request) -> GoogleBooksRepository:
+    # Built once in the lifespan handler so its rate limiter and circuit
+    # breaker see every call the process makes
+    repository = request.app.state.google_books_repository
+    if repository is None:
+        raise ValueError("GOOGLE_BOOKS_API_KEY environment variable is not set")
+    return repository
+
+
+def get_enrichment_service(request: Request) -> Optional[EnrichmentService]:
+    return request.app.state.enrichment_service
 
 
 # Dependency injection for services
 def get_author_service(
     author_repository: AuthorRepository = Depends(get_author_repository),
 ) -> AuthorService:
-    return AuthorService(author_repository)
+    return AuthorService(author_repository, max_batch_size=AUTHOR_BATCH_MAX_SIZE)
+
+
+def get_book_service(
+    book_repository: BookRepository = Depends(get_book_repository),
+    author_repository: AuthorRepository = Depends(get_author_repository),
+    enrichment_service: Optional[EnrichmentService] = Depends(get_enrichment_service),
+) -> BookService:
+    return BookService(
+        book_repository, author_repository, enrichment_service=enrichment_service
+    )
 
 
-async def get_book_service(
+# Only endpoints that call Google Books resolve the Google repository
+def get_google_book_service(
     book_repository: BookRepository = Depends(get_book_repository),
     author_repository: AuthorRepository = Depends(get_author_repository),
     google_books_repository: GoogleBooksRepository = Depends(
@@ -65,6 +289,21 @@ async def get_book_service(
     return BookService(book_repository, author_repository, google_books_repository)
 
 
+def get_book_import_service(
+    book_repository: BookRepository = Depends(get_book_repository),
+    author_repository: AuthorRepository = Depends(get_author_repository),
+) -> BookImportService:
+    return BookImportService(
+        book_repository, author_repository, batch_size=BOOK_IMPORT_BATCH_SIZE
+    )
+
+
+def get_book_export_service(
+    book_repository: BookRepository = Depends(get_book_repository),
+) -> BookExportService:
+    return BookExportService(book_repository, batch_size=BOOK_EXPORT_BATCH_SIZE)
+
+
 @app.get("/")
 async def root():
     return {"message": "Welcome to the Library Management System"}
@@ -75,19 +314,57 @@ async def root():
 async def create_author(
     author: AuthorCreate, author_service: AuthorService = Depends(get_author_service)
 ):
-    return author_service.create_author(author.name, author.bio)
+    return await author_service.create_author(author.name, author.bio)
+
+
+@app.post("/authors/batch", response_model=List[Author])
+async def create_authors(
+    authors: List[AuthorCreate],
+    author_service: AuthorService = Depends(get_author_service),
+):
+    # One INSERT ... RETURNING for the whole batch; results are in request order
+    return await author_service.create_authors(authors)
 
 
-@app.get("/authors/", response_model=List[Author])
-async def get_authors(author_service: AuthorService = Depends(get_author_service)):
-    return author_service.get_all_authors()
+@app.get(
+    "/authors/",
+    response_model=Union[List[Author], CursorPaginatedResponse[Author]],
+)
+async def get_authors(
+    response: Response,
+    size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    cursor: Optional[str] = Query(
+        None,
+        description="Switches to keyset pagination; pass an empty value for the "
+        "first page and the returned next_cursor for the following ones",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    author_service: AuthorService = Depends(get_author_service),
+):
+    if cursor is not None:
+        result = await author_service.get_authors_by_cursor(
+            cursor=cursor, size=size, if_none_match=if_none_match
+        )
+        response.headers["ETag"] = author_collection_etag(
+            result.items, result.size, result.next_cursor
+        )
+        return result
+    # The full list is streamed from a server-side cursor so memory stays flat
+    return StreamingResponse(
+        author_service.stream_authors(), media_type="application/json"
+    )
 
 
 @app.get("/authors/{author_id}", response_model=Author)
 async def get_author(
-    author_id: int, author_service: AuthorService = Depends(get_author_service)
+    author_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    author_service: AuthorService = Depends(get_author_service),
 ):
-    return author_service.get_author(author_id)
+    author = await author_service.get_author(author_id, if_none_match=if_none_match)
+    response.headers["ETag"] = author_etag(author)
+    return author
 
 
 # Book endpoints
@@ -98,23 +375,106 @@ async def create_book(
     return await book_service.create_book(book.title, book.isbn, book.author_id)
 
 
-@app.get("/books/", response_model=PaginatedResponse)
+@app.put("/books/isbn/{isbn}", response_model=Book)
+async def upsert_book(
+    book: BookUpsert,
+    isbn: str = Path(..., min_length=10, max_length=13, pattern=r"^[0-9-]+$"),
+    book_service: BookService = Depends(get_book_service),
+):
+    # Idempotent: creates the book or updates the one with this ISBN
+    return await book_service.upsert_book(book.title, isbn, book.author_id)
+
+
+@app.post("/books/import", response_model=BookImportResult)
+async def import_books(
+    request: Request,
+    book_import_service: BookImportService = Depends(get_book_import_service),
+):
+    # The body is parsed as it streams in: text/csv with a header row, anything
+    # else as newline-delimited JSON objects
+    content_type = request.headers.get("content-type", "")
+    if content_type.startswith("text/csv"):
+        rows = iter_csv_rows(request.stream())
+    else:
+        rows = iter_ndjson_rows(request.stream())
+    return await book_import_service.import_books(rows)
+
+
+@app.get(
+    "/books/",
+    response_model=Union[PaginatedResponse[Book], CursorPaginatedResponse[Book]],
+)
 async def get_books(
-    page: int = 1, size: int = 10, book_service: BookService = Depends(get_book_service)
+    response: Response,
+    page: int = 1,
+    size: int = Query(10, ge=1, le=MAX_PAGE_SIZE),
+    count: str = Query(
+        "cached",
+        description="How to compute total: exact, cached (short-TTL exact count "
+        "reset on writes), estimated (Postgres planner statistics) or none",
+    ),
+    cursor: Optional[str] = Query(
+        None,
+        description="Switches to keyset pagination; pass an empty value for the "
+        "first page and the returned next_cursor for the following ones",
+    ),
+    if_none_match: Optional[str] = Header(None),
+    book_service: BookService = Depends(get_book_service),
 ):
-    result = book_service.get_all_books(page=page, size=size)
-    return {
-        "items": result["items"],
-        "total": result["total"],
-        "page": result["page"],
-        "size": result["size"],
-        "pages": result["pages"],
-    }
+    if cursor is not None:
+        result = await book_service.get_books_by_cursor(
+            cursor=cursor, size=size, if_none_match=if_none_match
+        )
+        response.headers["ETag"] = book_collection_etag(
+            result.items, result.size, result.next_cursor
+        )
+        return result
+    result = await book_service.get_all_books(
+        page=page, size=size, count=count, if_none_match=if_none_match
+    )
+    response.headers["ETag"] = book_collection_etag(
+        result.items, result.page, result.size, result.total
+    )
+    return result
+
+
+@app.get("/books/search", response_model=PaginatedResponse[BookSearchResult])
+async def search_books(
+    q: str,
+    page: int = 1,
+    size: int = 10,
+    book_service: BookService = Depends(get_book_service),
+):
+    return await book_service.search_books(q, page=page, size=size)
+
+
+@app.get("/books/export")
+async def export_books(
+    format: str = Query("ndjson", description="ndjson or csv"),
+    gzip: bool = False,
+    book_export_service: BookExportService = Depends(get_book_export_service),
+):
+    # Every book with its author's fields, streamed as rows arrive from the
+    # database rather than paged through /books/
+    chunks = book_export_service.export_books(format, compress=gzip)
+    headers = {"Content-Disposition": f'attachment; filename="books.{format}"'}
+    if gzip:
+        headers["Content-Encoding"] = "gzip"
+    return StreamingResponse(
+        chunks, media_type=EXPORT_MEDIA_TYPES[format], headers=headers
+    )
 
 
 @app.get("/books/{book_id}", response_model=Book)
-async def get_book(book_id: int, book_service: BookService = Depends(get_book_service)):
-    return book_service.get_book(book_id)
+async def get_book(
+    book_id: int,
+    response: Response,
+    if_none_match: Optional[str] = Header(None),
+    book_service: BookService = Depends(get_book_service),
+):
+    book = await book_service.get_book(book_id, if_none_match=if_none_match)
+    response.headers["ETag"] = book_etag(book)
+    return book
 
 
 # Google Books API endpoints
@@ -122,7 +482,7 @@ async def get_book(book_id: int, book_service: BookService = Depends(get_book_se
 async def search_google_books(
     query: str,
     max_results: int = 10,
-    book_service: BookService = Depends(get_book_service),
+    book_service: BookService = Depends(get_google_book_service),
 ):
     return await book_service.search_google_books(query, max_results)
 
@@ -131,6 +491,109 @@ async def search_google_books(
 async def get_books_by_author(
     author_name: str,
     max_results: int = 10,
-    book_service: BookService = Depends(get_book_service),
+    book_service: BookService = Depends(get_google_book_service),
 ):
     return await book_service.get_books_by_author_from_google(author_name, max_results)
+
+
+@app.get("/google-books/cache/stats")
+async def get_google_books_cache_stats(
+    cache: TTLCache = Depends(get_google_books_cache),
+):
+    return cache.stats()
+
+
+@app.get("/metrics", include_in_schema=False)
+async def get_metrics(request: Request):
+    # Counters and histograms are recorded as requests run; pool and cache
+    # state is read at scrape time
+    pools = [(engine, stats) for engine, stats in get_pool_stats().items() if stats]
+    cache = request.app.state.google_books_cache.stats()
+    breaker = request.app.state.google_books_circuit_breaker
+    shared_caches = shared_cache_stats(request.app)
+    extra = [
+        *render_gauge(
+            "db_pool_checked_out",
+            "Connections currently checked out",
+            ("engine",),
+            [((engine,), stats["checked_out"]) for engine, stats in pools],
+        ),
+        *render_gauge(
+            "db_pool_overflow",
+            "Connections open beyond pool_size",
+            ("engine",),
+            [((engine,), stats.get("overflow", 0)) for engine, stats in pools],
+        ),
+        *render_gauge(
+            "db_pool_acquire_wait_seconds_total",
+            "Total time spent waiting for a connection",
+            ("engine",),
+            [((engine,), stats["wait_total_ms"] / 1000) for engine, stats in pools],
+            kind="counter",
+        ),
+        *render_gauge(
+            "db_pool_acquire_timeouts_total",
+            "Checkouts that timed out waiting for a connection",
+            ("engine",),
+            [((engine,), stats["timeouts"]) for engine, stats in pools],
+            kind="counter",
+        ),
+        *render_gauge(
+            "google_books_cache_events",
+            "Google Books response cache counters",
+            ("event",),
+            [
+                ((event,), cache[event])
+                for event in ("hits", "misses", "evictions", "coalesced", "stale_hits")
+            ],
+        ),
+        *render_gauge(
+            "shared_cache_events",
+            "Shared cache counters, as seen by this worker",
+            ("cache", "event"),
+            [
+                ((name, event), stats[event])
+                for name, stats in shared_caches.items()
+                for event in ("hits", "misses", "errors")
+            ],
+        ),
+        *render_gauge(
+            "google_books_circuit_open",
+            "1 while the Google Books circuit breaker is not closed",
+            (),
+            [((), int(breaker.state != breaker.CLOSED))],
+        ),
+    ]
+    return PlainTextResponse(
+        REGISTRY.render(extra), media_type="text/plain; version=0.0.4"
+    )
+
+
+def shared_cache_stats(app: FastAPI) -> Dict[str, Dict[str, Any]]:
+    # Disabled caches are left out
+    caches = {
+        "authors": app.state.author_cache,
+        "books": app.state.book_cache,
+        "book_pages": app.state.book_page_cache,
+        "google_books": app.state.google_books_shared_cache,
+    }
+    return {name: cache.stats() for name, cache in caches.items() if cache is not None}
+
+
+@app.get("/cache/stats")
+async def get_cache_stats(request: Request):
+    return {"backend": CACHE_BACKEND, "caches": shared_cache_stats(request.app)}
+
+
+@app.get("/db/pool/stats")
+async def get_db_pool_stats():
+    return get_pool_stats()
+
+
+@app.get("/google-books/status")
+async def get_google_books_status(request: Request):
+    return {
+        "circuit_breaker": request.app.state.google_books_circuit_breaker.stats(),
+        "rate_limiter": request.app.state.google_books_rate_limiter.stats(),
+        "cache": request.app.state.google_books_cache.stats(),
+    }
@@ -0,0 +1,241 @@
+import time
+from contextvars import ContextVar
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+# Seconds; roughly 1ms to 10s
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+Labels = Tuple[str, ...]
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def format_labels(names: Sequence[str], values: Sequence[Any]) -> str:
+    if not names:
+        return ""
+    pairs = ",".join(
+        f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)
+    )
+    return "{" + pairs + "}"
+
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Labels, float] = {}
+
+    def inc(self, *labels: Any, amount: float = 1.0) -> None:
+        key = tuple(str(label) for label in labels)
+        self._values[key] = self._values.get(key, 0.0) + amount
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} counter",
+        ]
+        for labels, value in sorted(self._values.items()):
+            lines.append(
+                f"{self.name}{format_labels(self.labelnames, labels)} "
+                f"{_format_value(value)}"
+            )
+        return lines
+
+
+class Histogram:
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets)
+        # Per label set: non-cumulative bucket counts (+Inf last), sum, count
+        self._series: Dict[Labels, List[Any]] = {}
+
+    def observe(self, value: float, *labels: Any) -> None:
+        key = tuple(str(label) for label in labels)
+        series = self._series.get(key)
+        if series is None:
+            series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+        counts = series[0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                counts[index] += 1
+                break
+        else:
+            counts[-1] += 1
+        series[1] += value
+        series[2] += 1
+
+    def collect(self) -> List[str]:
+        lines = [
+            f"# HELP {self.name} {self.documentation}",
+            f"# TYPE {self.name} histogram",
+        ]
+        names = self.labelnames + ("le",)
+        for labels, (counts, total, count) in sorted(self._series.items()):
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + ("+Inf",), counts):
+                cumulative += bucket_count
+                le = bound if bound == "+Inf" else _format_value(bound)
+                lines.append(
+                    f"{self.name}_bucket{format_labels(names, labels + (le,))} "
+                    f"{cumulative}"
+                )
+            label_text = format_labels(self.labelnames, labels)
+            lines.append(f"{self.name}_sum{label_text} {repr(float(total))}")
+            lines.append(f"{self.name}_count{label_text} {count}")
+        return lines
+
+
+def render_gauge(
+    name: str,
+    documentation: str,
+    labelnames: Sequence[str],
+    samples: Iterable[Tuple[Sequence[Any], float]],
+    kind: str = "gauge",
+) -> List[str]:
+    """Gauge lines for values read at scrape time (pool sizes, cache stats).
+
+    Running totals kept elsewhere are read the same way with
+    ``kind="counter"``.
+    """
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for labels, value in samples:
+        lines.append(
+            f"{name}{format_labels(labelnames, labels)} {_format_value(value)}"
+        )
+    return lines
+
+
+class Registry:
+    def __init__(self):
+        self.metrics: List[Any] = []
+
+    def register(self, metric: Any) -> Any:
+        self.metrics.append(metric)
+        return metric
+
+    def render(self, extra: Iterable[str] = ()) -> str:
+        lines: List[str] = []
+        for metric in self.metrics:
+            lines.extend(metric.collect())
+        lines.extend(extra)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUESTS = REGISTRY.register(
+    Counter("http_requests_total", "HTTP requests", ("method", "route", "status"))
+)
+HTTP_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_duration_seconds", "HTTP request latency", ("method", "route")
+    )
+)
+HTTP_REQUEST_SQL_QUERIES = REGISTRY.register(
+    Histogram(
+        "http_request_sql_queries",
+        "SQL statements executed per HTTP request",
+        ("route",),
+        COUNT_BUCKETS,
+    )
+)
+HTTP_REQUEST_SQL_DURATION = REGISTRY.register(
+    Histogram(
+        "http_request_sql_duration_seconds",
+        "Time spent in SQL per HTTP request",
+        ("route",),
+    )
+)
+DB_QUERY_DURATION = REGISTRY.register(
+    Histogram("db_query_duration_seconds", "SQL statement latency", ("engine",))
+)
+GOOGLE_BOOKS_REQUEST_DURATION = REGISTRY.register(
+    Histogram(
+        "google_books_request_duration_seconds",
+        "Outbound Google Books request latency",
+        ("status",),
+    )
+)
+
+
+class RequestTimings:
+    """Where one request spent its time, filled in as it runs"""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.phases: Dict[str, float] = {"sql": 0.0, "google": 0.0}
+        self.calls: Dict[str, int] = {"sql": 0, "google": 0}
+
+    def add(self, phase: str, seconds: float) -> None:
+        self.phases[phase] = self.phases.get(phase, 0.0) + seconds
+        self.calls[phase] = self.calls.get(phase, 0) + 1
+
+    @property
+    def sql_queries(self) -> int:
+        return self.calls["sql"]
+
+    @property
+    def google_calls(self) -> int:
+        return self.calls["google"]
+
+
+_current_timings: ContextVar[Optional[RequestTimings]] = ContextVar(
+    "request_timings", default=None
+)
+
+
+def start_request() -> RequestTimings:
+    timings = RequestTimings()
+    _current_timings.set(timings)
+    return timings
+
+
+def record_phase(phase: str, seconds: float) -> None:
+    """Count one call in ``phase`` against the current request, if any"""
+    timings = _current_timings.get()
+    if timings is not None:
+        timings.add(phase, seconds)
+
+
+def record_google_call(status: Any, seconds: float) -> None:
+    GOOGLE_BOOKS_REQUEST_DURATION.observe(seconds, status)
+    record_phase("google", seconds)
+
+
+def instrument_engine(engine: Engine, label: str) -> None:
+    """Time every statement run on ``engine`` (the sync_engine of an async one)"""
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, many):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, many):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        DB_QUERY_DURATION.observe(elapsed, label)
+        record_phase("sql", elapsed)
+
+    @event.listens_for(engine, "handle_error")
+    def handle_error(exception_context):
+        # A failed statement never reaches after_cursor_execute
+        connection = exception_context.connection
+        if connection is not None and connection.info.get("query_started"):
+            connection.info["query_started"].pop()
@@ -0,0 +1,77 @@
+import logging
+import time
+from typing import Any, Callable, Dict, Optional
+from .metrics import (
+    HTTP_REQUEST_DURATION,
+    HTTP_REQUEST_SQL_DURATION,
+    HTTP_REQUEST_SQL_QUERIES,
+    HTTP_REQUESTS,
+    RequestTimings,
+    start_request,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class MetricsMiddleware:
+    """Records per-route latency, SQL and Google Books time for each request.
+
+    Requests slower than ``slow_request_threshold`` seconds (if set) are logged
+    with a per-phase breakdown. Routes are labelled by their path template, so
+    the number of series stays bounded.
+    """
+
+    def __init__(self, app: Callable, slow_request_threshold: Optional[float] = None):
+        self.app = app
+        self.slow_request_threshold = slow_request_threshold
+
+    async def __call__(self, scope: Dict[str, Any], receive: Callable, send: Callable):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        timings = start_request()
+        status = 500
+
+        async def send_with_status(message: Dict[str, Any]) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_status)
+        finally:
+            self._record(scope, status, timings)
+
+    def _record(
+        self, scope: Dict[str, Any], status: int, timings: RequestTimings
+    ) -> None:
+        elapsed = time.perf_counter() - timings.started
+        # The router stores the matched route in the scope
+        route = getattr(scope.get("route"), "path", None) or "unmatched"
+        method = scope["method"]
+
+        HTTP_REQUESTS.inc(method, route, status)
+        HTTP_REQUEST_DURATION.observe(elapsed, method, route)
+        HTTP_REQUEST_SQL_QUERIES.observe(timings.sql_queries, route)
+        HTTP_REQUEST_SQL_DURATION.observe(timings.phases["sql"], route)
+
+        if (
+            self.slow_request_threshold is not None
+            and elapsed >= self.slow_request_threshold
+        ):
+            other = elapsed - sum(timings.phases.values())
+            logger.warning(
+                "Slow request %s %s -> %s in %.1fms: sql %.1fms (%d queries), "
+                "google %.1fms (%d calls), other %.1fms",
+                method,
+                scope["path"],
+                status,
+                elapsed * 1000,
+                timings.phases["sql"] * 1000,
+                timings.sql_queries,
+                timings.phases["google"] * 1000,
+                timings.google_calls,
+                max(other, 0.0) * 1000,
+            )
@@ -1,7 +1,23 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
+from sqlalchemy import (
+    DDL,
+    JSON,
+    Column,
+    DateTime,
+    ForeignKey,
+    Index,
+    Integer,
+    String,
+    event,
+    func,
+    text,
+)
 from sqlalchemy.orm import relationship
 from .database import Base
 
+# Text search configuration, spelled as a literal so the query expression
+# matches the GIN index expression exactly
+SEARCH_CONFIG = text("'english'::regconfig")
+
 
 class Author(Base):
     __tablename__ = "authors"
@@ -10,9 +26,14 @@ class Author(Base):
     name = Column(String, index=True)
     bio = Column(String, nullable=True)
 
+    # Row version for ETags, bumped by the ORM on every update
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Relationship with books
     books = relationship("Book", back_populates="author")
 
+    __mapper_args__ = {"version_id_col": version}
+
 
 class Book(Base):
     __tablename__ = "books"
@@ -21,8 +42,66 @@ class Book(Base):
     title = Column(String, index=True)
     isbn = Column(String, unique=True, index=True)
 
+    # Metadata filled in asynchronously from Google Books
+    description = Column(String, nullable=True)
+    publisher = Column(String, nullable=True)
+    published_date = Column(String, nullable=True)
+
+    # Row version for ETags, bumped by the ORM on every update; Core UPDATEs
+    # must bump it themselves
+    version = Column(Integer, nullable=False, default=1, server_default="1")
+
     # Foreign key to author
     author_id = Column(Integer, ForeignKey("authors.id"))
 
-    # Relationship with author
-    author = relationship("Author", back_populates="books")
+    # Relationship with author; queries must eager-load it, so a forgotten
+    # option fails loudly instead of issuing one SELECT per book
+    author = relationship("Author", back_populates="books", lazy="raise_on_sql")
+
+    __mapper_args__ = {"version_id_col": version}
+
+
+class GoogleBookCacheEntry(Base):
+    __tablename__ = "google_books_cache"
+
+    # Normalized ISBN (no hyphens or spaces)
+    isbn = Column(String, primary_key=True)
+
+    # Null volume_id records that Google has no volume for this ISBN
+    volume_id = Column(String, nullable=True)
+    title = Column(String, nullable=True)
+    authors = Column(JSON, nullable=True)
+    description = Column(String, nullable=True)
+    published_date = Column(String, nullable=True)
+    publisher = Column(String, nullable=True)
+
+    fetched_at = Column(DateTime(timezone=True), nullable=False)
+
+
+def book_title_tsvector():
+    return func.to_tsvector(SEARCH_CONFIG, Book.title)
+
+
+# Search indexes (Postgres only): full-text on book titles, trigram on book
+# titles and author names for fuzzy matching
+Index("ix_books_title_fts", book_title_tsvector(), postgresql_using="gin").ddl_if(
+    dialect="postgresql"
+)
+Index(
+    "ix_books_title_trgm",
+    Book.title,
+    postgresql_using="gin",
+    postgresql_ops={"title": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_authors_name_trgm",
+    Author.name,
+    postgresql_using="gin",
+    postgresql_ops={"name": "gin_trgm_ops"},
+).ddl_if(dialect="postgresql")
+
+event.listen(
+    Base.metadata,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,32 @@
+import base64
+import binascii
+import json
+from typing import List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+def encode_cursor(last_id: int) -> str:
+    """Encode the last seen id as an opaque, URL-safe cursor token"""
+    payload = json.dumps({"id": last_id}, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode()
+
+
+def decode_cursor(cursor: str) -> int:
+    """Return the id encoded in a cursor token, raising ValueError if malformed"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        last_id = json.loads(base64.urlsafe_b64decode(padded))["id"]
+    except (binascii.Error, UnicodeDecodeError, ValueError, KeyError, TypeError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(last_id, int) or isinstance(last_id, bool):
+        raise ValueError("Invalid cursor")
+    return last_id
+
+
+def split_page(rows: Sequence[T], size: int) -> Tuple[List[T], Optional[str]]:
+    """Trim rows fetched with ``limit=size + 1`` to one page plus its next cursor"""
+    if len(rows) <= size:
+        return list(rows), None
+    page = list(rows[:size])
+    return page, encode_cursor(page[-1].id)
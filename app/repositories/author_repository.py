@@ -1,20 +1,72 @@
-from sqlalchemy.orm import Session
+from sqlalchemy import desc, insert, select
+from sqlalchemy.ext.asyncio import AsyncSession
+from .base import ReplicaReadRepository
 from ..models import Author
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set
 
 
-class AuthorRepository:
-    def __init__(self, db: Session):
-        self.db = db
-
-    def create(self, name: str, bio: str = None) -> Author:
-        db_author = Author(name=name, bio=bio)
-        self.db.add(db_author)
-        self.db.commit()
-        self.db.refresh(db_author)
+class AuthorRepository(ReplicaReadRepository[Author]):
+    async def create(self, name: str, bio: str = None) -> Author:
+        # RETURNING hands back the generated columns, so no refresh is needed
+        self._wrote = True
+        db_author = await self.db.scalar(
+            insert(Author).values(name=name, bio=bio).returning(Author)
+        )
+        await self.db.commit()
+        # Forget an earlier "not found" for this id
+        await self._invalidate(db_author.id)
         return db_author
 
-    def get_all(self) -> list[Author]:
-        return self.db.query(Author).all()
+    async def bulk_create(self, authors: List[Dict[str, Any]]) -> List[Author]:
+        """Insert many authors with INSERT ... RETURNING, in the given order"""
+        if not authors:
+            return []
+        self._wrote = True
+        result = await self.db.scalars(
+            insert(Author).returning(Author, sort_by_parameter_order=True), authors
+        )
+        db_authors = list(result.all())
+        await self.db.commit()
+        await self._invalidate(*(db_author.id for db_author in db_authors))
+        return db_authors
+
+    async def get_all(self) -> list[Author]:
+        result = await self._reader.execute(select(Author))
+        return list(result.scalars().all())
+
+    async def get_page_after(
+        self, last_id: Optional[int] = None, limit: int = 10
+    ) -> List[Author]:
+        query = select(Author)
+        if last_id is not None:
+            query = query.filter(Author.id < last_id)
+        result = await self._reader.execute(
+            query.order_by(desc(Author.id)).limit(limit)
+        )
+        return list(result.scalars().all())
+
+    async def stream_all(self, batch_size: int = 1000) -> AsyncIterator[Author]:
+        # Server-side cursor: rows arrive batch_size at a time instead of all at once
+        result = await self._reader.stream_scalars(
+            select(Author).order_by(Author.id).execution_options(yield_per=batch_size)
+        )
+        async for author in result:
+            yield author
+
+    async def _get_by_ids(
+        self, session: AsyncSession, author_ids: Iterable[int]
+    ) -> Dict[int, Author]:
+        result = await session.execute(
+            select(Author).filter(Author.id.in_(set(author_ids)))
+        )
+        return {author.id: author for author in result.scalars()}
 
-    def get_by_id(self, author_id: int) -> Author:
-        return self.db.query(Author).filter(Author.id == author_id).first()
+    async def get_existing_ids(self, author_ids: Iterable[int]) -> Set[int]:
+        author_ids = set(author_ids)
+        if not author_ids:
+            return set()
+        # On the primary: the ids are about to be referenced by inserts
+        result = await self.db.execute(
+            select(Author.id).filter(Author.id.in_(author_ids))
+        )
+        return set(result.scalars().all())
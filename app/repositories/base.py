@@ -0,0 +1,79 @@
+import asyncio
+from sqlalchemy.ext.asyncio import AsyncSession
+from typing import Dict, Generic, Iterable, List, Optional, TypeVar
+from ..loader import DataLoader
+from ..shared_cache import SharedCache
+
+M = TypeVar("M")
+
+
+class ReplicaReadRepository(Generic[M]):
+    """Base for repositories whose read-only queries may go to a replica.
+
+    It also owns the by-id lookups: ``get_by_id`` goes through a per-request
+    DataLoader and, when given, a shared entity cache. Subclasses only
+    provide the query, ``_get_by_ids``.
+    """
+
+    def __init__(
+        self,
+        db: AsyncSession,
+        read_db: Optional[AsyncSession] = None,
+        entity_cache: Optional[SharedCache] = None,
+    ):
+        self.db = db
+        self.read_db = read_db if read_db is not None else db
+        # Set by every write; from then on reads go to the primary
+        self._wrote = False
+        # Shared across requests, keyed by id; get_by_id checks it first
+        self.entity_cache = entity_cache
+        # The repository lives for one request, and so do the memoized rows
+        self._loader: DataLoader[int, M] = DataLoader(self._load_by_ids)
+
+    @property
+    def _reader(self) -> AsyncSession:
+        # Once this request has written, reads go to the primary so they see
+        # the write rather than a replica that may lag behind it
+        return self.db if self._wrote else self.read_db
+
+    async def get_by_id(self, entity_id: int) -> Optional[M]:
+        # Lookups made in the same tick share one SELECT ... WHERE id IN (...)
+        return await self._loader.load(entity_id)
+
+    async def get_by_ids(self, ids: Iterable[int]) -> Dict[int, M]:
+        return await self._get_by_ids(self._reader, ids)
+
+    async def _get_by_ids(
+        self, session: AsyncSession, ids: Iterable[int]
+    ) -> Dict[int, M]:
+        raise NotImplementedError
+
+    async def _load_by_ids(self, ids: List[int]) -> Dict[int, M]:
+        # Each DataLoader batch runs as a task of its own, so the loaders of
+        # the book and author repositories may run at once on the request's
+        # shared session. An AsyncSession allows one operation at a time, so
+        # batches take turns on a lock kept with the session. Code awaiting a
+        # load must not run other queries on the session concurrently with it
+        # (e.g. in the same gather).
+        async def get_by_ids(session: AsyncSession, ids: List[int]) -> Dict[int, M]:
+            async with _session_lock(session):
+                return await self._get_by_ids(session, ids)
+
+        if self.entity_cache is None:
+            return await get_by_ids(self._reader, ids)
+        # Misses are read on the primary: a replica lagging behind a write
+        # that just invalidated an entry would put the old row back, to be
+        # served to every worker for the whole TTL
+        return await self.entity_cache.get_many_or_load(
+            ids, lambda missing: get_by_ids(self.db, missing)
+        )
+
+    async def _invalidate(self, *ids: int) -> None:
+        for entity_id in ids:
+            self._loader.clear(entity_id)
+        if self.entity_cache is not None:
+            await self.entity_cache.delete(*ids)
+
+
+def _session_lock(session: AsyncSession) -> asyncio.Lock:
+    return session.info.setdefault("loader_lock", asyncio.Lock())
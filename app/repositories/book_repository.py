@@ -1,30 +1,316 @@
-from sqlalchemy.orm import Session
-from sqlalchemy import desc
-from ..models import Book
-from typing import List, Tuple
+from sqlalchemy import RowMapping, case, desc, func, or_, select, text, union, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import contains_eager, joinedload, selectinload
+from ..cache import TTLCache
+from ..shared_cache import SharedCache
+from .base import ReplicaReadRepository
+from ..models import Author, Book, SEARCH_CONFIG, book_title_tsvector
+from typing import Any, AsyncIterator, Dict, Iterable, List, Optional, Set, Tuple
 
+COUNT_STRATEGIES = ("exact", "cached", "estimated", "none")
 
-class BookRepository:
-    def __init__(self, db: Session):
-        self.db = db
+# Ways to load Book.author together with the books: joined adds a JOIN to the
+# same SELECT, selectin issues one extra SELECT ... WHERE id IN (...) per query
+AUTHOR_LOADERS = {"joined": joinedload, "selectin": selectinload}
 
-    def create(self, title: str, isbn: str, author_id: int) -> Book:
-        db_book = Book(title=title, isbn=isbn, author_id=author_id)
-        self.db.add(db_book)
-        self.db.commit()
-        self.db.refresh(db_book)
+
+class BookRepository(ReplicaReadRepository[Book]):
+    def __init__(
+        self,
+        db: AsyncSession,
+        count_cache: Optional[TTLCache] = None,
+        author_loading: str = "joined",
+        read_db: Optional[AsyncSession] = None,
+        entity_cache: Optional[SharedCache] = None,
+        page_cache: Optional[SharedCache] = None,
+    ):
+        if author_loading not in AUTHOR_LOADERS:
+            raise ValueError(f"Unknown author loading strategy: {author_loading}")
+        super().__init__(db, read_db, entity_cache)
+        self.count_cache = count_cache
+        # Shared get_all pages, all dropped (by generation) on any book write
+        self.page_cache = page_cache
+        self.author_loader = AUTHOR_LOADERS[author_loading]
+
+    async def create(self, title: str, isbn: str, author_id: int) -> Optional[Book]:
+        """Insert a book in one statement, or return None if its ISBN is taken"""
+        self._wrote = True
+        db_book = await self.db.scalar(
+            insert(Book)
+            .values(title=title, isbn=isbn, author_id=author_id)
+            .on_conflict_do_nothing(index_elements=[Book.isbn])
+            .returning(Book)
+            # Lazy loading is not available on AsyncSession; an author this
+            # session already holds is taken from its identity map
+            .options(selectinload(Book.author))
+        )
+        await self.db.commit()
+        if db_book is None:
+            return None
+        self._invalidate_count()
+        await self._invalidate(db_book.id)
         return db_book
 
-    def get_all(self, skip: int = 0, limit: int = 10) -> Tuple[List[Book], int]:
+    async def upsert(self, title: str, isbn: str, author_id: int) -> Book:
+        """Insert a book, or update the one with this ISBN, in one statement.
+
+        Repeating the same upsert leaves the row (and its version) unchanged,
+        so retried requests are safe.
+        """
+        self._wrote = True
+        statement = insert(Book).values(title=title, isbn=isbn, author_id=author_id)
+        excluded = statement.excluded
+        changed = or_(
+            Book.title != excluded.title, Book.author_id != excluded.author_id
+        )
+        db_book = await self.db.scalar(
+            statement.on_conflict_do_update(
+                index_elements=[Book.isbn],
+                set_={
+                    "title": excluded.title,
+                    "author_id": excluded.author_id,
+                    "version": case((changed, Book.version + 1), else_=Book.version),
+                },
+            )
+            .returning(Book)
+            .options(selectinload(Book.author)),
+            # Refresh a copy of the row this session may already hold
+            execution_options={"populate_existing": True},
+        )
+        await self.db.commit()
+        self._invalidate_count()
+        await self._invalidate(db_book.id)
+        return db_book
+
+    async def bulk_create(self, books: List[Dict[str, Any]]) -> Set[str]:
+        """Insert many books in one multi-row INSERT and return the inserted ISBNs.
+
+        Rows whose ISBN already exists are skipped rather than failing the batch.
+        """
+        if not books:
+            return set()
+        self._wrote = True
+        result = await self.db.execute(
+            insert(Book)
+            .values(books)
+            .on_conflict_do_nothing(index_elements=[Book.isbn])
+            .returning(Book.isbn)
+        )
+        inserted = set(result.scalars().all())
+        await self.db.commit()
+        self._invalidate_count()
+        self._loader.clear_all()
+        # New rows only: there are no cached copies of them to drop
+        if self.page_cache is not None:
+            await self.page_cache.clear()
+        return inserted
+
+    async def get_all(
+        self, skip: int = 0, limit: int = 10, count: str = "exact"
+    ) -> Tuple[List[Book], Optional[int], str]:
+        # count=exact promises a current total, so it skips the page cache
+        if self.page_cache is None or count == "exact":
+            return await self._get_page(skip, limit, count)
+        loaded = None
+
+        async def load() -> Tuple[List[Book], Optional[int], str]:
+            nonlocal loaded
+            loaded = await self._get_page(skip, limit, count)
+            return loaded
+
+        # Cached pages hold Book schemas rather than ORM rows
+        page = await self.page_cache.get_or_load((skip, limit, count), load)
+        books, total, count_type = page
+        if page is not loaded and count_type == "exact":
+            # An exact total served from the cache may be up to the TTL old
+            count_type = "cached"
+        return books, total, count_type
+
+    async def _get_page(
+        self, skip: int, limit: int, count: str
+    ) -> Tuple[List[Book], Optional[int], str]:
         # Get total count
-        total = self.db.query(Book).count()
+        total, count_type = await self.count(count)
 
         # Get paginated results
-        books = (
-            self.db.query(Book).order_by(desc(Book.id)).offset(skip).limit(limit).all()
+        result = await self._reader.execute(
+            select(Book)
+            .options(self.author_loader(Book.author))
+            .order_by(desc(Book.id))
+            .offset(skip)
+            .limit(limit)
+        )
+        books = list(result.scalars().all())
+
+        return books, total, count_type
+
+    async def count(self, strategy: str = "exact") -> Tuple[Optional[int], str]:
+        """Count books with the given strategy, returning (total, count_type).
+
+        ``count_type`` reports what was actually returned: a strategy falls back
+        to an exact count when its cheaper source has nothing to offer.
+        """
+        if strategy == "none":
+            return None, "none"
+        if strategy == "estimated":
+            estimate = await self._estimate_count()
+            if estimate is not None:
+                return estimate, "estimated"
+        if strategy == "cached" and self.count_cache is not None:
+            total = self.count_cache.get(Book.__tablename__)
+            if total is not None:
+                return total, "cached"
+
+        total = await self._reader.scalar(select(func.count()).select_from(Book))
+        if strategy == "cached" and self.count_cache is not None:
+            self.count_cache.set(Book.__tablename__, total)
+        return total, "exact"
+
+    async def _estimate_count(self) -> Optional[int]:
+        # The planner's row estimate is only available on Postgres
+        if self._reader.get_bind().dialect.name != "postgresql":
+            return None
+        estimate = await self._reader.scalar(
+            text(
+                "SELECT reltuples::bigint FROM pg_class "
+                "WHERE oid = to_regclass(:table)"
+            ),
+            {"table": Book.__tablename__},
+        )
+        # reltuples is -1 (or 0 before the first ANALYZE) on fresh tables
+        if estimate is None or estimate <= 0:
+            return None
+        return estimate
+
+    async def _invalidate(self, *book_ids: int) -> None:
+        await super()._invalidate(*book_ids)
+        if self.page_cache is not None:
+            await self.page_cache.clear()
+
+    def _invalidate_count(self) -> None:
+        if self.count_cache is not None:
+            self.count_cache.delete(Book.__tablename__)
+
+    async def get_page_after(
+        self, last_id: Optional[int] = None, limit: int = 10
+    ) -> List[Book]:
+        # Keyset pagination: seek past the last seen id through the primary key
+        # index, so every page costs the same regardless of its depth
+        query = select(Book).options(self.author_loader(Book.author))
+        if last_id is not None:
+            query = query.filter(Book.id < last_id)
+        result = await self._reader.execute(query.order_by(desc(Book.id)).limit(limit))
+        return list(result.scalars().all())
+
+    async def stream_export(
+        self, batch_size: int = 1000
+    ) -> AsyncIterator[List[RowMapping]]:
+        """Yield every book with its author's fields, batch_size rows at a time.
+
+        One SELECT read through a server-side cursor: Postgres answers it from
+        a single snapshot, so rows inserted mid-export are neither skipped nor
+        repeated, and the author columns come from the same LEFT JOIN (null for
+        books without an author).
+        """
+        result = await self._reader.stream(
+            select(
+                Book.id,
+                Book.title,
+                Book.isbn,
+                Book.author_id,
+                Author.name.label("author_name"),
+                Author.bio.label("author_bio"),
+                Book.description,
+                Book.publisher,
+                Book.published_date,
+                Book.version,
+            )
+            .outerjoin(Book.author)
+            .order_by(Book.id)
+            .execution_options(yield_per=batch_size)
         )
+        async for rows in result.mappings().partitions():
+            yield rows
 
-        return books, total
+    async def search(
+        self, query: str, skip: int = 0, limit: int = 10
+    ) -> Tuple[List[Tuple[Book, float]], int]:
+        """Rank books whose title or author name matches ``query``.
 
-    def get_by_id(self, book_id: int) -> Book:
-        return self.db.query(Book).filter(Book.id == book_id).first()
+        Titles match on full-text search or trigram similarity, author names on
+        trigram similarity; each branch is answered by its own GIN index.
+        """
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query)
+        title_vector = book_title_tsvector()
+        matched = union(
+            select(Book.id).filter(
+                or_(
+                    title_vector.bool_op("@@")(ts_query), Book.title.bool_op("%")(query)
+                )
+            ),
+            select(Book.id).join(Book.author).filter(Author.name.bool_op("%")(query)),
+        ).subquery()
+
+        score = (
+            func.ts_rank_cd(title_vector, ts_query)
+            + func.greatest(
+                func.similarity(Book.title, query), func.similarity(Author.name, query)
+            )
+        ).label("score")
+        result = await self._reader.execute(
+            select(Book, score, func.count().over().label("total"))
+            .join(Book.author)
+            .options(contains_eager(Book.author))
+            .filter(Book.id.in_(select(matched.c.id)))
+            .order_by(desc(score), desc(Book.id))
+            .offset(skip)
+            .limit(limit)
+        )
+        rows = result.all()
+
+        # The window count rides along with the page; past the last page there
+        # are no rows to carry it, so count the matches directly
+        if rows:
+            total = rows[0].total
+        elif skip:
+            total = await self._reader.scalar(select(func.count()).select_from(matched))
+        else:
+            total = 0
+
+        return [(row.Book, row.score) for row in rows], total
+
+    async def _get_by_ids(
+        self, session: AsyncSession, book_ids: Iterable[int]
+    ) -> Dict[int, Book]:
+        result = await session.execute(
+            select(Book)
+            .options(self.author_loader(Book.author))
+            .filter(Book.id.in_(set(book_ids)))
+        )
+        return {book.id: book for book in result.unique().scalars()}
+
+    async def update_metadata(
+        self,
+        book_id: int,
+        description: Optional[str] = None,
+        publisher: Optional[str] = None,
+        published_date: Optional[str] = None,
+    ) -> bool:
+        self._wrote = True
+        # Cached copies may be attached to this session and be expired by the
+        # UPDATE, so they are dropped before it runs as well as after
+        await self._invalidate(book_id)
+        result = await self.db.execute(
+            update(Book)
+            .where(Book.id == book_id)
+            .values(
+                description=description,
+                publisher=publisher,
+                published_date=published_date,
+                version=Book.version + 1,
+            )
+        )
+        await self.db.commit()
+        await self._invalidate(book_id)
+        return result.rowcount > 0
@@ -0,0 +1,85 @@
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, Iterable, Optional
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..models import GoogleBookCacheEntry
+from .google_books_repository import GoogleBook
+
+
+class GoogleBooksCacheRepository:
+    """Google Books metadata by ISBN, persisted so every worker shares it.
+
+    Entries older than ``ttl`` seconds are treated as missing, so the next
+    lookup refreshes them from Google. ISBNs Google has no volume for are
+    stored too, and come back as None.
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], AsyncSession],
+        ttl: float = 7 * 24 * 3600,
+    ):
+        self.session_factory = session_factory
+        self.ttl = ttl
+
+    async def get_many(self, isbns: Iterable[str]) -> Dict[str, Optional[GoogleBook]]:
+        """Return fresh entries only; ISBNs without one are left out"""
+        isbns = list(isbns)
+        if not isbns:
+            return {}
+        cutoff = datetime.now(timezone.utc) - timedelta(seconds=self.ttl)
+        async with self.session_factory() as db:
+            result = await db.execute(
+                select(GoogleBookCacheEntry).filter(
+                    GoogleBookCacheEntry.isbn.in_(isbns),
+                    GoogleBookCacheEntry.fetched_at > cutoff,
+                )
+            )
+            return {
+                entry.isbn: self._to_google_book(entry) for entry in result.scalars()
+            }
+
+    async def set_many(self, books: Dict[str, Optional[GoogleBook]]) -> None:
+        if not books:
+            return
+        fetched_at = datetime.now(timezone.utc)
+        rows = [
+            {
+                "isbn": isbn,
+                "volume_id": book.id if book else None,
+                "title": book.title if book else None,
+                "authors": book.authors if book else None,
+                "description": book.description if book else None,
+                "published_date": book.published_date if book else None,
+                "publisher": book.publisher if book else None,
+                "fetched_at": fetched_at,
+            }
+            for isbn, book in books.items()
+        ]
+        statement = insert(GoogleBookCacheEntry).values(rows)
+        statement = statement.on_conflict_do_update(
+            index_elements=[GoogleBookCacheEntry.isbn],
+            set_={
+                column: statement.excluded[column]
+                for column in rows[0]
+                if column != "isbn"
+            },
+        )
+        async with self.session_factory() as db:
+            await db.execute(statement)
+            await db.commit()
+
+    @staticmethod
+    def _to_google_book(entry: GoogleBookCacheEntry) -> Optional[GoogleBook]:
+        if entry.volume_id is None:
+            return None
+        return GoogleBook(
+            id=entry.volume_id,
+            title=entry.title or "",
+            authors=entry.authors or [],
+            description=entry.description,
+            isbn=entry.isbn,
+            published_date=entry.published_date,
+            publisher=entry.publisher,
+        )
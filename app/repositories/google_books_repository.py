@@ -1,6 +1,30 @@
-from typing import Optional, List, Dict
+import asyncio
+import os
+import time
+from typing import TYPE_CHECKING, Any, Iterable, Optional, List, Dict, Tuple
 import httpx
 from pydantic import BaseModel
+from ..cache import TTLCache
+from ..metrics import record_google_call
+from ..resilience import (
+    CircuitBreaker,
+    DeadlineExceededError,
+    TokenBucket,
+    UpstreamUnavailableError,
+    backoff_delay,
+)
+
+if TYPE_CHECKING:
+    from ..shared_cache import SharedCache
+    from .google_books_cache_repository import GoogleBooksCacheRepository
+
+# Overridable to point at a stand-in server (e.g. for load tests)
+GOOGLE_BOOKS_BASE_URL = os.getenv(
+    "GOOGLE_BOOKS_BASE_URL", "https://www.googleapis.com/books/v1/volumes"
+)
+
+# Upstream answers worth retrying, and counting against the circuit breaker
+RETRY_STATUS_CODES = {429, 500, 502, 503, 504}
 
 
 class GoogleBook(BaseModel):
@@ -14,40 +38,244 @@ class GoogleBook(BaseModel):
 
 
 class GoogleBooksRepository:
-    BASE_URL = "https://www.googleapis.com/books/v1/volumes"
+    BASE_URL = GOOGLE_BOOKS_BASE_URL
+    # Largest page the volumes endpoint will return
+    MAX_RESULTS_PER_QUERY = 40
 
-    def __init__(self, api_key: str):
+    def __init__(
+        self,
+        api_key: str,
+        client: Optional[httpx.AsyncClient] = None,
+        cache: Optional[TTLCache] = None,
+        rate_limiter: Optional[TokenBucket] = None,
+        circuit_breaker: Optional[CircuitBreaker] = None,
+        deadline: Optional[float] = None,
+        max_retries: int = 0,
+        isbn_cache: Optional["GoogleBooksCacheRepository"] = None,
+        shared_cache: Optional["SharedCache"] = None,
+    ):
         self.api_key = api_key
-        self.client = httpx.AsyncClient()
+        # A shared client is owned by the application lifespan, not by us
+        self._owns_client = client is None
+        self.client = client if client is not None else httpx.AsyncClient()
+        self.cache = cache
+        self.rate_limiter = rate_limiter
+        self.circuit_breaker = circuit_breaker
+        self.deadline = deadline
+        self.max_retries = max_retries
+        # Persistent ISBN lookups shared across workers, checked after the
+        # in-process cache and before the network
+        self.isbn_cache = isbn_cache
+        # Search results shared across workers, checked when the in-process
+        # cache misses and before the network
+        self.shared_cache = shared_cache
 
     async def search_books(self, query: str, max_results: int = 10) -> List[GoogleBook]:
+        if self.cache is None:
+            return await self._load_books(query, max_results)
+        key = (query, max_results)
+        try:
+            books = await self.cache.get_or_load(
+                key, lambda: self._load_books(query, max_results)
+            )
+        except (httpx.HTTPError, UpstreamUnavailableError):
+            # Serve an expired result rather than nothing while upstream is down
+            books = self.cache.get_stale(key)
+            if books is None:
+                raise
+        # Callers get their own list so the cached one is never mutated
+        return list(books)
+
+    async def _load_books(self, query: str, max_results: int) -> List[GoogleBook]:
+        if self.shared_cache is None:
+            return await self._fetch_books(query, max_results)
+        return await self.shared_cache.get_or_load(
+            (query, max_results), lambda: self._fetch_books(query, max_results)
+        )
+
+    async def _fetch_books(self, query: str, max_results: int) -> List[GoogleBook]:
+        items = await self._fetch_volumes(query, max_results)
+        return [self._to_google_book(item) for item in items]
+
+    async def _fetch_volumes(
+        self, query: str, max_results: int
+    ) -> List[Dict[str, Any]]:
         params = {"q": query, "maxResults": max_results, "key": self.api_key}
 
-        response = await self.client.get(f"{self.BASE_URL}", params=params)
+        breaker = self.circuit_breaker
+        if breaker is not None:
+            breaker.before_call()
+        healthy = None
+        try:
+            try:
+                response = await asyncio.wait_for(
+                    self._get_with_retries(params), timeout=self.deadline
+                )
+            except asyncio.TimeoutError:
+                healthy = False
+                raise DeadlineExceededError("Google Books deadline exceeded")
+            except httpx.TransportError:
+                healthy = False
+                raise
+            healthy = response.status_code not in RETRY_STATUS_CODES
+        finally:
+            if breaker is not None:
+                if healthy is None:
+                    breaker.release()
+                elif healthy:
+                    breaker.record_success()
+                else:
+                    breaker.record_failure()
+
         response.raise_for_status()
+        return response.json().get("items", [])
 
-        books_data = response.json()
-        books = []
-
-        for item in books_data.get("items", []):
-            volume_info = item["volumeInfo"]
-            book = GoogleBook(
-                id=item["id"],
-                title=volume_info.get("title", ""),
-                authors=volume_info.get("authors", []),
-                description=volume_info.get("description"),
-                isbn=self._extract_isbn(volume_info.get("industryIdentifiers", [])),
-                published_date=volume_info.get("publishedDate"),
-                publisher=volume_info.get("publisher"),
-            )
-            books.append(book)
+    async def _get_with_retries(self, params: Dict[str, Any]) -> httpx.Response:
+        attempt = 0
+        while True:
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire()
+            delay = backoff_delay(attempt)
+            start = time.perf_counter()
+            try:
+                response = await self.client.get(f"{self.BASE_URL}", params=params)
+            except httpx.TransportError:
+                record_google_call("error", time.perf_counter() - start)
+                if attempt >= self.max_retries:
+                    raise
+            else:
+                record_google_call(response.status_code, time.perf_counter() - start)
+                if (
+                    response.status_code not in RETRY_STATUS_CODES
+                    or attempt >= self.max_retries
+                ):
+                    return response
+                # Upstream may tell us how long to back off for
+                retry_after = response.headers.get("Retry-After", "")
+                if retry_after.isdigit():
+                    delay = max(delay, float(retry_after))
+            await asyncio.sleep(delay)
+            attempt += 1
 
-        return books
+    def _to_google_book(self, item: Dict[str, Any]) -> GoogleBook:
+        volume_info = item["volumeInfo"]
+        return GoogleBook(
+            id=item["id"],
+            title=volume_info.get("title", ""),
+            authors=volume_info.get("authors", []),
+            description=volume_info.get("description"),
+            isbn=self._extract_isbn(volume_info.get("industryIdentifiers", [])),
+            published_date=volume_info.get("publishedDate"),
+            publisher=volume_info.get("publisher"),
+        )
 
     async def get_book_by_isbn(self, isbn: str) -> Optional[GoogleBook]:
-        query = f"isbn:{isbn}"
-        books = await self.search_books(query, max_results=1)
-        return books[0] if books else None
+        found, errors = await self._lookup_isbns([isbn])
+        key = self._normalize_isbn(isbn)
+        if key in errors:
+            raise errors[key]
+        return found.get(key)
+
+    async def get_books_by_isbns(
+        self,
+        isbns: Iterable[str],
+        max_concurrency: int = 10,
+        isbns_per_query: int = 1,
+    ) -> Dict[str, Optional[GoogleBook]]:
+        """Look up many ISBNs at once, returning a mapping to the book or None.
+
+        Duplicates (including differently hyphenated forms) are fetched once,
+        and ISBNs found in the in-process or persistent cache are not fetched.
+        With ``isbns_per_query`` > 1, ISBNs are OR-ed into shared queries and
+        matched back through each volume's identifiers. At most
+        ``max_concurrency`` upstream requests are in flight at a time. An ISBN
+        whose lookup failed maps to None without failing the rest of the batch.
+        """
+        isbns = list(isbns)
+        found, _ = await self._lookup_isbns(isbns, max_concurrency, isbns_per_query)
+        return {isbn: found.get(self._normalize_isbn(isbn)) for isbn in isbns}
+
+    async def _lookup_isbns(
+        self,
+        isbns: List[str],
+        max_concurrency: int = 10,
+        isbns_per_query: int = 1,
+    ) -> Tuple[Dict[str, Optional[GoogleBook]], Dict[str, BaseException]]:
+        """Return the books found by normalized ISBN, and the lookup errors"""
+        normalized = {isbn: self._normalize_isbn(isbn) for isbn in isbns}
+        found: Dict[str, Optional[GoogleBook]] = {}
+        pending = []
+        for isbn in dict.fromkeys(normalized.values()):
+            cached = (
+                self.cache.get((self._isbn_query(isbn), 1))
+                if self.cache is not None
+                else None
+            )
+            if cached is not None:
+                found[isbn] = cached[0] if cached else None
+            else:
+                pending.append(isbn)
+
+        if pending and self.isbn_cache is not None:
+            stored = await self.isbn_cache.get_many(pending)
+            for isbn, book in stored.items():
+                found[isbn] = book
+                if self.cache is not None:
+                    self.cache.set((self._isbn_query(isbn), 1), [book] if book else [])
+            pending = [isbn for isbn in pending if isbn not in stored]
+
+        semaphore = asyncio.Semaphore(max_concurrency)
+        fetched: Dict[str, Optional[GoogleBook]] = {}
+
+        async def lookup(chunk: List[str]) -> None:
+            async with semaphore:
+                if len(chunk) == 1:
+                    books = await self.search_books(
+                        self._isbn_query(chunk[0]), max_results=1
+                    )
+                    fetched[chunk[0]] = books[0] if books else None
+                else:
+                    fetched.update(await self._get_books_by_isbn_chunk(chunk))
+
+        chunks = [
+            pending[i : i + isbns_per_query]
+            for i in range(0, len(pending), isbns_per_query)
+        ]
+        errors: Dict[str, BaseException] = {}
+        try:
+            results = await asyncio.gather(
+                *(lookup(chunk) for chunk in chunks), return_exceptions=True
+            )
+            for chunk, result in zip(chunks, results):
+                if isinstance(result, BaseException):
+                    errors.update(dict.fromkeys(chunk, result))
+        finally:
+            # Keep what did come back, even if other lookups failed
+            if fetched and self.isbn_cache is not None:
+                await self.isbn_cache.set_many(fetched)
+        found.update(fetched)
+        return found, errors
+
+    async def _get_books_by_isbn_chunk(
+        self, isbns: List[str]
+    ) -> Dict[str, Optional[GoogleBook]]:
+        query = " OR ".join(self._isbn_query(isbn) for isbn in isbns)
+        items = await self._fetch_volumes(
+            query, max_results=min(len(isbns) * 2, self.MAX_RESULTS_PER_QUERY)
+        )
+
+        found: Dict[str, Optional[GoogleBook]] = dict.fromkeys(isbns)
+        for item in items:
+            identifiers = item["volumeInfo"].get("industryIdentifiers", [])
+            for identifier in self._extract_isbns(identifiers):
+                if identifier in found and found[identifier] is None:
+                    found[identifier] = self._to_google_book(item)
+
+        # Seed the single-ISBN cache entries so later lookups skip the network
+        if self.cache is not None:
+            for isbn, book in found.items():
+                self.cache.set((self._isbn_query(isbn), 1), [book] if book else [])
+        return found
 
     async def get_books_by_author(
         self, author_name: str, max_results: int = 10
@@ -61,5 +289,22 @@ class GoogleBooksRepository:
                 return identifier.get("identifier")
         return None
 
+    def _extract_isbns(self, identifiers: List[Dict[str, str]]) -> List[str]:
+        return [
+            self._normalize_isbn(identifier["identifier"])
+            for identifier in identifiers
+            if identifier.get("type") in ["ISBN_10", "ISBN_13"]
+            and identifier.get("identifier")
+        ]
+
+    @staticmethod
+    def _normalize_isbn(isbn: str) -> str:
+        return isbn.replace("-", "").replace(" ", "").upper()
+
+    @staticmethod
+    def _isbn_query(isbn: str) -> str:
+        return f"isbn:{isbn}"
+
     async def close(self):
-        await self.client.aclose()
+        if self._owns_client:
+            await self.client.aclose()
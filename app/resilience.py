@@ -0,0 +1,143 @@
+import asyncio
+import random
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class UpstreamUnavailableError(Exception):
+    """An upstream call was not attempted or did not finish in time"""
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    pass
+
+
+class DeadlineExceededError(UpstreamUnavailableError):
+    pass
+
+
+class TokenBucket:
+    """Client-side rate limiter: ``rate`` tokens per second, bursts up to ``capacity``.
+
+    Waiters are served in arrival order.
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.rate = rate
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated = clock()
+        self._lock = asyncio.Lock()
+        self.waits = 0
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self._tokens = min(
+            self.capacity, self._tokens + (now - self._updated) * self.rate
+        )
+        self._updated = now
+
+    def try_acquire(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    async def acquire(self) -> None:
+        async with self._lock:
+            while not self.try_acquire():
+                self.waits += 1
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+    def stats(self) -> Dict[str, Any]:
+        self._refill()
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tokens": round(self._tokens, 2),
+            "waits": self.waits,
+        }
+
+
+class CircuitBreaker:
+    """Fails calls fast after ``failure_threshold`` consecutive failures.
+
+    The circuit stays open for ``reset_timeout`` seconds, then lets a single
+    trial call through (half-open): success closes it, failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = 5,
+        reset_timeout: float = 30.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self.times_opened = 0
+        self.rejected = 0
+
+    def before_call(self) -> None:
+        if self.state == self.OPEN:
+            if self._clock() - self.opened_at < self.reset_timeout:
+                self.rejected += 1
+                raise CircuitOpenError("Circuit breaker is open")
+            self.state = self.HALF_OPEN
+        if self.state == self.HALF_OPEN:
+            if self._trial_in_flight:
+                self.rejected += 1
+                raise CircuitOpenError("Circuit breaker is half-open")
+            self._trial_in_flight = True
+
+    def record_success(self) -> None:
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = None
+        self._trial_in_flight = False
+
+    def release(self) -> None:
+        # The call ended without a verdict (e.g. it was cancelled)
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.consecutive_failures += 1
+        self._trial_in_flight = False
+        if (
+            self.state == self.HALF_OPEN
+            or self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != self.OPEN:
+                self.times_opened += 1
+            self.state = self.OPEN
+            self.opened_at = self._clock()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "failure_threshold": self.failure_threshold,
+            "reset_timeout": self.reset_timeout,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+def backoff_delay(attempt: int, base: float = 0.2, cap: float = 5.0) -> float:
+    """Full-jitter exponential backoff for the given 0-based retry attempt"""
+    return random.uniform(0, min(cap, base * 2**attempt))
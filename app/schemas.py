@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field, ConfigDict
-from typing import List, Optional, Dict, Any
+from typing import Generic, List, Optional, Dict, TypeVar
+
+T = TypeVar("T")
 
 
 class AuthorBase(BaseModel):
@@ -13,6 +15,8 @@ class AuthorCreate(AuthorBase):
 
 class Author(AuthorBase):
     id: int
+    # Row version, bumped on every update; the basis of the ETag
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
 
 
@@ -26,25 +30,61 @@ class BookCreate(BookBase):
     pass
 
 
+class BookUpsert(BaseModel):
+    # The ISBN comes from the path
+    title: str = Field(..., min_length=1, max_length=200)
+    author_id: int = Field(..., gt=0)
+
+
 class BookAuthor(BaseModel):
     id: int
     name: str
     bio: Optional[str]
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
 
 
 class Book(BookBase):
     id: int
     author: BookAuthor
+    description: Optional[str] = None
+    publisher: Optional[str] = None
+    published_date: Optional[str] = None
+    version: int = 1
     model_config = ConfigDict(from_attributes=True)
 
 
-class PaginatedResponse(BaseModel):
-    items: List[Any]
-    total: int = Field(..., ge=0)
+class BookSearchResult(Book):
+    score: float
+
+
+class PaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
+    total: Optional[int] = Field(None, ge=0)
     page: int = Field(..., gt=0)
     size: int = Field(..., gt=0)
-    pages: int = Field(..., ge=0)
+    pages: Optional[int] = Field(None, ge=0)
+    # How total was obtained: exact, cached, estimated or none
+    count_type: str = "exact"
+
+
+class CursorPaginatedResponse(BaseModel, Generic[T]):
+    items: List[T]
+    size: int = Field(..., gt=0)
+    next_cursor: Optional[str] = None
+
+
+class BookImportError(BaseModel):
+    row: int
+    isbn: Optional[str] = None
+    detail: str
+
+
+class BookImportResult(BaseModel):
+    total: int = Field(..., ge=0)
+    imported: int = Field(..., ge=0)
+    failed: int = Field(..., ge=0)
+    errors: List[BookImportError]
 
 
 class GoogleBook(BaseModel):
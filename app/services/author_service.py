@@ -1,24 +1,85 @@
 from fastapi import HTTPException
 from ..repositories.author_repository import AuthorRepository
 from ..models import Author
-from ..schemas import Author as AuthorSchema
-from typing import List
+from ..schemas import Author as AuthorSchema, AuthorCreate, CursorPaginatedResponse
+from ..pagination import decode_cursor, split_page
+from ..etag import author_collection_etag, author_etag, raise_if_not_modified
+from typing import AsyncIterator, List, Optional
 
 
 class AuthorService:
-    def __init__(self, author_repository: AuthorRepository):
+    def __init__(self, author_repository: AuthorRepository, max_batch_size: int = 1000):
         self.author_repository = author_repository
+        self.max_batch_size = max_batch_size
 
-    def create_author(self, name: str, bio: str = None) -> AuthorSchema:
-        db_author = self.author_repository.create(name, bio)
+    async def create_author(self, name: str, bio: str = None) -> AuthorSchema:
+        db_author = await self.author_repository.create(name, bio)
         return AuthorSchema.model_validate(db_author)
 
-    def get_all_authors(self) -> List[AuthorSchema]:
-        authors = self.author_repository.get_all()
+    async def create_authors(self, authors: List[AuthorCreate]) -> List[AuthorSchema]:
+        if len(authors) > self.max_batch_size:
+            raise HTTPException(
+                status_code=400,
+                detail=f"At most {self.max_batch_size} authors can be created at once",
+            )
+        db_authors = await self.author_repository.bulk_create(
+            [author.model_dump() for author in authors]
+        )
+        return [AuthorSchema.model_validate(author) for author in db_authors]
+
+    async def get_all_authors(self) -> List[AuthorSchema]:
+        authors = await self.author_repository.get_all()
         return [AuthorSchema.model_validate(author) for author in authors]
 
-    def get_author(self, author_id: int) -> AuthorSchema:
-        author = self.author_repository.get_by_id(author_id)
+    async def get_authors_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        size: int = 10,
+        if_none_match: Optional[str] = None,
+    ) -> CursorPaginatedResponse[AuthorSchema]:
+        if size < 1:
+            raise HTTPException(status_code=400, detail="Size must be greater than 0")
+
+        last_id = None
+        if cursor:
+            try:
+                last_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Fetch one extra row to know whether there is a next page
+        authors = await self.author_repository.get_page_after(last_id, limit=size + 1)
+        authors, next_cursor = split_page(authors, size)
+        raise_if_not_modified(
+            if_none_match, author_collection_etag(authors, size, next_cursor)
+        )
+
+        return CursorPaginatedResponse[AuthorSchema](
+            items=[AuthorSchema.model_validate(author) for author in authors],
+            size=size,
+            next_cursor=next_cursor,
+        )
+
+    async def stream_authors(self, batch_size: int = 1000) -> AsyncIterator[str]:
+        """Yield every author as chunks of one JSON array, one chunk per batch"""
+        yield "["
+        separator = ""
+        chunk = []
+        async for author in self.author_repository.stream_all(batch_size):
+            chunk.append(AuthorSchema.model_validate(author).model_dump_json())
+            if len(chunk) >= batch_size:
+                yield separator + ",".join(chunk)
+                separator = ","
+                chunk = []
+        if chunk:
+            yield separator + ",".join(chunk)
+        yield "]"
+
+    async def get_author(
+        self, author_id: int, if_none_match: Optional[str] = None
+    ) -> AuthorSchema:
+        author = await self.author_repository.get_by_id(author_id)
         if not author:
             raise HTTPException(status_code=404, detail="Author not found")
+        raise_if_not_modified(if_none_match, author_etag(author))
         return AuthorSchema.model_validate(author)
@@ -0,0 +1,67 @@
+import csv
+import io
+import json
+import zlib
+from typing import AsyncIterable, AsyncIterator, Union
+from fastapi import HTTPException
+from ..repositories.book_repository import BookRepository
+
+EXPORT_MEDIA_TYPES = {"ndjson": "application/x-ndjson", "csv": "text/csv"}
+
+EXPORT_COLUMNS = (
+    "id",
+    "title",
+    "isbn",
+    "author_id",
+    "author_name",
+    "author_bio",
+    "description",
+    "publisher",
+    "published_date",
+    "version",
+)
+
+
+async def gzip_chunks(chunks: AsyncIterable[str]) -> AsyncIterator[bytes]:
+    """Compress a stream of text chunks into one gzip stream"""
+    compressor = zlib.compressobj(wbits=zlib.MAX_WBITS | 16)
+    async for chunk in chunks:
+        # A sync flush per chunk lets the client decompress what it has so far
+        yield compressor.compress(chunk.encode()) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+class BookExportService:
+    def __init__(self, book_repository: BookRepository, batch_size: int = 1000):
+        self.book_repository = book_repository
+        self.batch_size = batch_size
+
+    def export_books(
+        self, format: str = "ndjson", compress: bool = False
+    ) -> AsyncIterator[Union[str, bytes]]:
+        # Validated before streaming starts, while an error status can still be sent
+        if format not in EXPORT_MEDIA_TYPES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Format must be one of: {', '.join(EXPORT_MEDIA_TYPES)}",
+            )
+        chunks = self._ndjson_chunks() if format == "ndjson" else self._csv_chunks()
+        return gzip_chunks(chunks) if compress else chunks
+
+    async def _ndjson_chunks(self) -> AsyncIterator[str]:
+        # One chunk per batch read from the cursor, so memory stays flat
+        async for rows in self.book_repository.stream_export(self.batch_size):
+            yield "".join(
+                json.dumps(dict(row), separators=(",", ":")) + "\n" for row in rows
+            )
+
+    async def _csv_chunks(self) -> AsyncIterator[str]:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+        async for rows in self.book_repository.stream_export(self.batch_size):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows([row[column] for column in EXPORT_COLUMNS] for row in rows)
+            yield buffer.getvalue()
@@ -0,0 +1,173 @@
+import codecs
+import csv
+import io
+import json
+from typing import AsyncIterable, AsyncIterator, Dict, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from ..repositories.book_repository import BookRepository
+from ..repositories.author_repository import AuthorRepository
+from ..schemas import BookCreate, BookImportError, BookImportResult
+
+# A parsed input row: its 1-based position and either the raw record or the
+# reason it could not be parsed
+ParsedRow = Tuple[int, Union[Dict[str, object], str]]
+
+
+async def iter_lines(chunks: AsyncIterable[bytes]) -> AsyncIterator[str]:
+    """Split a stream of UTF-8 byte chunks into lines, keeping line endings"""
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    async for chunk in chunks:
+        buffer += decoder.decode(chunk)
+        *lines, buffer = buffer.split("\n")
+        for line in lines:
+            yield line + "\n"
+    buffer += decoder.decode(b"", final=True)
+    if buffer:
+        yield buffer
+
+
+async def iter_ndjson_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    row_number = 0
+    async for line in iter_lines(chunks):
+        if not line.strip():
+            continue
+        row_number += 1
+        try:
+            record = json.loads(line)
+        except ValueError:
+            yield row_number, "Invalid JSON"
+            continue
+        if not isinstance(record, dict):
+            yield row_number, "Expected a JSON object"
+            continue
+        yield row_number, record
+
+
+async def iter_csv_rows(chunks: AsyncIterable[bytes]) -> AsyncIterator[ParsedRow]:
+    header = None
+    row_number = 0
+    pending = ""
+    async for line in iter_lines(chunks):
+        pending += line
+        # An odd number of quotes means a quoted field continues on the next line
+        if pending.count('"') % 2:
+            continue
+        record, pending = pending, ""
+        values = next(csv.reader(io.StringIO(record)), None)
+        if not values:
+            continue
+        if header is None:
+            header = [name.strip() for name in values]
+            continue
+        row_number += 1
+        if len(values) != len(header):
+            yield row_number, f"Expected {len(header)} columns, got {len(values)}"
+            continue
+        yield row_number, dict(zip(header, values))
+    if pending.strip():
+        yield row_number + 1, "Unterminated quoted field"
+
+
+class _ImportProgress:
+    """Counts and errors for one import_books call"""
+
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+        self.total = 0
+        self.imported = 0
+        self.failed = 0
+        self.errors: List[BookImportError] = []
+
+    def add_error(self, row_number: int, isbn: Optional[str], detail: str) -> None:
+        self.failed += 1
+        # Keep the report bounded; failed still counts every rejected row
+        if len(self.errors) < self.max_errors:
+            self.errors.append(
+                BookImportError(row=row_number, isbn=isbn, detail=detail)
+            )
+
+    def result(self) -> BookImportResult:
+        return BookImportResult(
+            total=self.total,
+            imported=self.imported,
+            failed=self.failed,
+            errors=sorted(self.errors, key=lambda error: error.row),
+        )
+
+
+class BookImportService:
+    def __init__(
+        self,
+        book_repository: BookRepository,
+        author_repository: AuthorRepository,
+        batch_size: int = 1000,
+        max_errors: int = 1000,
+    ):
+        self.book_repository = book_repository
+        self.author_repository = author_repository
+        self.batch_size = batch_size
+        self.max_errors = max_errors
+
+    async def import_books(self, rows: AsyncIterable[ParsedRow]) -> BookImportResult:
+        progress = _ImportProgress(self.max_errors)
+        batch: List[Tuple[int, BookCreate]] = []
+        async for row_number, record in rows:
+            progress.total += 1
+            if isinstance(record, str):
+                progress.add_error(row_number, None, record)
+                continue
+            try:
+                book = BookCreate.model_validate(record)
+            except ValidationError as exc:
+                isbn = record.get("isbn")
+                progress.add_error(
+                    row_number,
+                    isbn if isinstance(isbn, str) else None,
+                    _format_validation_error(exc),
+                )
+                continue
+
+            batch.append((row_number, book))
+            if len(batch) >= self.batch_size:
+                await self._flush(batch, progress)
+                batch = []
+        await self._flush(batch, progress)
+        return progress.result()
+
+    async def _flush(
+        self, batch: List[Tuple[int, BookCreate]], progress: _ImportProgress
+    ) -> None:
+        if not batch:
+            return
+
+        # One query for every author referenced by the batch
+        existing_author_ids = await self.author_repository.get_existing_ids(
+            book.author_id for _, book in batch
+        )
+
+        rows: List[Tuple[int, BookCreate]] = []
+        seen_isbns = set()
+        for row_number, book in batch:
+            if book.author_id not in existing_author_ids:
+                progress.add_error(row_number, book.isbn, "Author not found")
+            elif book.isbn in seen_isbns:
+                progress.add_error(row_number, book.isbn, "Duplicate ISBN in import")
+            else:
+                seen_isbns.add(book.isbn)
+                rows.append((row_number, book))
+
+        inserted = await self.book_repository.bulk_create(
+            [book.model_dump() for _, book in rows]
+        )
+        progress.imported += len(inserted)
+        for row_number, book in rows:
+            if book.isbn not in inserted:
+                progress.add_error(row_number, book.isbn, "ISBN already exists")
+
+
+def _format_validation_error(exc: ValidationError) -> str:
+    return "; ".join(
+        f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+        for error in exc.errors()
+    )
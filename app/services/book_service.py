@@ -1,9 +1,18 @@
 from fastapi import HTTPException
-from ..repositories.book_repository import BookRepository
+from ..repositories.book_repository import BookRepository, COUNT_STRATEGIES
 from ..repositories.author_repository import AuthorRepository
 from ..repositories.google_books_repository import GoogleBooksRepository, GoogleBook
+from .enrichment_service import EnrichmentService
 from ..models import Book
-from ..schemas import Book as BookSchema, PaginatedResponse
+from ..schemas import (
+    Book as BookSchema,
+    BookSearchResult,
+    PaginatedResponse,
+    CursorPaginatedResponse,
+)
+from ..pagination import decode_cursor, split_page
+from ..etag import book_collection_etag, book_etag, raise_if_not_modified
+from ..resilience import UpstreamUnavailableError
 from typing import List, Optional, Dict
 
 
@@ -12,55 +21,158 @@ class BookService:
         self,
         book_repository: BookRepository,
         author_repository: AuthorRepository,
-        google_books_repository: GoogleBooksRepository,
+        google_books_repository: Optional[GoogleBooksRepository] = None,
+        enrichment_service: Optional[EnrichmentService] = None,
     ):
         self.book_repository = book_repository
         self.author_repository = author_repository
         self.google_books_repository = google_books_repository
+        self.enrichment_service = enrichment_service
 
     async def create_book(self, title: str, isbn: str, author_id: int) -> BookSchema:
         # Check if author exists
-        author = self.author_repository.get_by_id(author_id)
+        author = await self.author_repository.get_by_id(author_id)
         if not author:
             raise HTTPException(status_code=404, detail="Author not found")
 
-        # Try to get additional book information from Google Books
-        google_book = await self.google_books_repository.get_book_by_isbn(isbn)
+        db_book = await self.book_repository.create(title, isbn, author_id)
+        if db_book is None:
+            raise HTTPException(
+                status_code=409, detail="A book with this ISBN already exists"
+            )
+
+        # Google Books metadata is fetched in the background, off the request path
+        if self.enrichment_service is not None:
+            self.enrichment_service.enqueue(db_book.id, isbn)
 
-        db_book = self.book_repository.create(title, isbn, author_id)
         return BookSchema.model_validate(db_book)
 
-    def get_all_books(self, page: int = 1, size: int = 10) -> PaginatedResponse:
+    async def upsert_book(self, title: str, isbn: str, author_id: int) -> BookSchema:
+        author = await self.author_repository.get_by_id(author_id)
+        if not author:
+            raise HTTPException(status_code=404, detail="Author not found")
+
+        db_book = await self.book_repository.upsert(title, isbn, author_id)
+
+        # Only books that have not been enriched yet need Google Books metadata
+        if self.enrichment_service is not None and db_book.description is None:
+            self.enrichment_service.enqueue(db_book.id, isbn)
+
+        return BookSchema.model_validate(db_book)
+
+    async def get_all_books(
+        self,
+        page: int = 1,
+        size: int = 10,
+        count: str = "exact",
+        if_none_match: Optional[str] = None,
+    ) -> PaginatedResponse[BookSchema]:
         if page < 1:
             raise HTTPException(status_code=400, detail="Page must be greater than 0")
         if size < 1:
             raise HTTPException(status_code=400, detail="Size must be greater than 0")
+        if count not in COUNT_STRATEGIES:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Count must be one of: {', '.join(COUNT_STRATEGIES)}",
+            )
 
         skip = (page - 1) * size
-        books, total = self.book_repository.get_all(skip=skip, limit=size)
+        books, total, count_type = await self.book_repository.get_all(
+            skip=skip, limit=size, count=count
+        )
+        raise_if_not_modified(
+            if_none_match, book_collection_etag(books, page, size, total)
+        )
 
-        return PaginatedResponse(
+        return PaginatedResponse[BookSchema](
             items=[BookSchema.model_validate(book) for book in books],
             total=total,
             page=page,
             size=size,
+            pages=(total + size - 1) // size if total is not None else None,
+            count_type=count_type,
+        )
+
+    async def get_books_by_cursor(
+        self,
+        cursor: Optional[str] = None,
+        size: int = 10,
+        if_none_match: Optional[str] = None,
+    ) -> CursorPaginatedResponse[BookSchema]:
+        if size < 1:
+            raise HTTPException(status_code=400, detail="Size must be greater than 0")
+
+        last_id = None
+        if cursor:
+            try:
+                last_id = decode_cursor(cursor)
+            except ValueError:
+                raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        # Fetch one extra row to know whether there is a next page
+        books = await self.book_repository.get_page_after(last_id, limit=size + 1)
+        books, next_cursor = split_page(books, size)
+        raise_if_not_modified(
+            if_none_match, book_collection_etag(books, size, next_cursor)
+        )
+
+        return CursorPaginatedResponse[BookSchema](
+            items=[BookSchema.model_validate(book) for book in books],
+            size=size,
+            next_cursor=next_cursor,
+        )
+
+    async def search_books(
+        self, query: str, page: int = 1, size: int = 10
+    ) -> PaginatedResponse[BookSearchResult]:
+        if not query.strip():
+            raise HTTPException(status_code=400, detail="Query must not be empty")
+        if page < 1:
+            raise HTTPException(status_code=400, detail="Page must be greater than 0")
+        if size < 1:
+            raise HTTPException(status_code=400, detail="Size must be greater than 0")
+
+        skip = (page - 1) * size
+        results, total = await self.book_repository.search(query, skip=skip, limit=size)
+
+        return PaginatedResponse[BookSearchResult](
+            # Each row is validated once; the score needs no validation
+            items=[
+                BookSearchResult.model_construct(
+                    **dict(BookSchema.model_validate(book)), score=score
+                )
+                for book, score in results
+            ],
+            total=total,
+            page=page,
+            size=size,
             pages=(total + size - 1) // size,
         )
 
-    def get_book(self, book_id: int) -> BookSchema:
-        book = self.book_repository.get_by_id(book_id)
+    async def get_book(
+        self, book_id: int, if_none_match: Optional[str] = None
+    ) -> BookSchema:
+        book = await self.book_repository.get_by_id(book_id)
         if not book:
             raise HTTPException(status_code=404, detail="Book not found")
+        raise_if_not_modified(if_none_match, book_etag(book))
         return BookSchema.model_validate(book)
 
     async def search_google_books(
         self, query: str, max_results: int = 10
     ) -> List[GoogleBook]:
-        return await self.google_books_repository.search_books(query, max_results)
+        try:
+            return await self.google_books_repository.search_books(query, max_results)
+        except UpstreamUnavailableError as exc:
+            raise HTTPException(status_code=503, detail=str(exc))
 
     async def get_books_by_author_from_google(
         self, author_name: str, max_results: int = 10
     ) -> List[GoogleBook]:
-        return await self.google_books_repository.get_books_by_author(
-            author_name, max_results
-        )
+        try:
+            return await self.google_books_repository.get_books_by_author(
+                author_name, max_results
+            )
+        except UpstreamUnavailableError as exc:
+            raise HTTPException(status_code=503, detail=str(exc))
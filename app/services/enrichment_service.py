@@ -0,0 +1,99 @@
+import asyncio
+import logging
+from typing import Callable, List, Optional, Tuple
+import httpx
+from sqlalchemy.ext.asyncio import AsyncSession
+from ..shared_cache import SharedCache
+from ..repositories.book_repository import BookRepository
+from ..repositories.google_books_repository import GoogleBooksRepository
+from ..resilience import UpstreamUnavailableError
+
+logger = logging.getLogger(__name__)
+
+
+class EnrichmentService:
+    """Background stage that fills in Google Books metadata for new books.
+
+    Jobs sit in a bounded in-process queue and are handled by a fixed number of
+    worker tasks, so enrichment never adds latency to the request that created
+    the book. Upstream HTTP failures are retried with exponential backoff.
+    """
+
+    def __init__(
+        self,
+        google_books_repository: GoogleBooksRepository,
+        session_factory: Callable[[], AsyncSession],
+        concurrency: int = 4,
+        max_attempts: int = 3,
+        retry_delay: float = 1.0,
+        maxsize: int = 10000,
+        book_cache: Optional[SharedCache] = None,
+        page_cache: Optional[SharedCache] = None,
+    ):
+        self.google_books_repository = google_books_repository
+        self.session_factory = session_factory
+        # Enriched books are dropped from these so readers see the new metadata
+        self.book_cache = book_cache
+        self.page_cache = page_cache
+        self.concurrency = concurrency
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.queue: "asyncio.Queue[Tuple[int, str]]" = asyncio.Queue(maxsize)
+        self._workers: List[asyncio.Task] = []
+
+    def start(self) -> None:
+        self._workers = [
+            asyncio.create_task(self._worker()) for _ in range(self.concurrency)
+        ]
+
+    async def stop(self) -> None:
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+
+    async def join(self) -> None:
+        await self.queue.join()
+
+    def enqueue(self, book_id: int, isbn: str) -> bool:
+        try:
+            self.queue.put_nowait((book_id, isbn))
+        except asyncio.QueueFull:
+            logger.warning("Enrichment queue full, skipping book %s", book_id)
+            return False
+        return True
+
+    async def _worker(self) -> None:
+        while True:
+            book_id, isbn = await self.queue.get()
+            try:
+                await self._enrich_with_retry(book_id, isbn)
+            except Exception:
+                logger.exception("Failed to enrich book %s", book_id)
+            finally:
+                self.queue.task_done()
+
+    async def _enrich_with_retry(self, book_id: int, isbn: str) -> None:
+        for attempt in range(1, self.max_attempts + 1):
+            try:
+                await self.enrich(book_id, isbn)
+                return
+            except (httpx.HTTPError, UpstreamUnavailableError):
+                if attempt == self.max_attempts:
+                    raise
+                await asyncio.sleep(self.retry_delay * 2 ** (attempt - 1))
+
+    async def enrich(self, book_id: int, isbn: str) -> bool:
+        google_book = await self.google_books_repository.get_book_by_isbn(isbn)
+        if google_book is None:
+            return False
+
+        async with self.session_factory() as session:
+            return await BookRepository(
+                session, entity_cache=self.book_cache, page_cache=self.page_cache
+            ).update_metadata(
+                book_id,
+                description=google_book.description,
+                publisher=google_book.publisher,
+                published_date=google_book.published_date,
+            )
@@ -0,0 +1,418 @@
+import asyncio
+import logging
+import time
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+from urllib.parse import urlsplit
+from pydantic import TypeAdapter
+from .cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# A value that never expires, for counters such as cache generations
+NO_EXPIRY = float("inf")
+
+
+class CacheBackendError(Exception):
+    """The cache backend could not be reached or rejected a command"""
+
+
+class RedisReplyError(CacheBackendError):
+    """An error reply; the connection itself is still usable"""
+
+
+class MemoryBackend:
+    """Byte values in this process, with the same interface as RedisBackend.
+
+    Values are serialized just as they would be for Redis, so switching
+    backends does not change what callers get back.
+    """
+
+    name = "memory"
+
+    def __init__(
+        self, maxsize: int = 10000, clock: Callable[[], float] = time.monotonic
+    ):
+        self._entries = TTLCache(maxsize=maxsize, clock=clock)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        return [self._entries.get(key) for key in keys]
+
+    async def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        for key, value in items.items():
+            self._entries.set(key, value, ttl=ttl)
+
+    async def delete_many(self, keys: Sequence[str]) -> None:
+        for key in keys:
+            self._entries.delete(key)
+
+    async def incr(self, key: str) -> int:
+        value = int(self._entries.get(key) or 0) + 1
+        self._entries.set(key, str(value).encode(), ttl=NO_EXPIRY)
+        return value
+
+    async def close(self) -> None:
+        self._entries.clear()
+
+
+def encode_command(*args: Any) -> bytes:
+    parts = [f"*{len(args)}\r\n".encode()]
+    for arg in args:
+        data = arg if isinstance(arg, bytes) else str(arg).encode()
+        parts.append(b"$%d\r\n%s\r\n" % (len(data), data))
+    return b"".join(parts)
+
+
+async def read_reply(reader: asyncio.StreamReader) -> Any:
+    line = await reader.readuntil(b"\r\n")
+    kind, payload = line[:1], line[1:-2]
+    if kind == b"+":
+        return payload.decode()
+    if kind == b"-":
+        raise RedisReplyError(payload.decode())
+    if kind == b":":
+        return int(payload)
+    if kind == b"$":
+        length = int(payload)
+        if length < 0:
+            return None
+        return (await reader.readexactly(length + 2))[:-2]
+    if kind == b"*":
+        length = int(payload)
+        if length < 0:
+            return None
+        return [await read_reply(reader) for _ in range(length)]
+    raise CacheBackendError(f"Unexpected reply: {line!r}")
+
+
+class RedisBackend:
+    """Minimal asyncio client for the Redis protocol (RESP2).
+
+    Only the handful of commands the cache needs are used, so any server that
+    speaks the protocol will do. Each call pipelines its commands over one
+    pooled connection: one round trip however many keys it touches.
+    """
+
+    name = "redis"
+
+    def __init__(self, url: str, pool_size: int = 10, timeout: float = 1.0):
+        parts = urlsplit(url)
+        self.host = parts.hostname or "localhost"
+        self.port = parts.port or 6379
+        self.password = parts.password
+        self.db = int(parts.path.lstrip("/") or 0)
+        self.timeout = timeout
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._slots = asyncio.Semaphore(pool_size)
+
+    async def get_many(self, keys: Sequence[str]) -> List[Optional[bytes]]:
+        if not keys:
+            return []
+        [values] = await self._execute([("MGET", *keys)])
+        return values
+
+    async def set_many(self, items: Dict[str, bytes], ttl: float) -> None:
+        if items:
+            ttl_ms = max(int(ttl * 1000), 1)
+            await self._execute(
+                [("SET", key, value, "PX", ttl_ms) for key, value in items.items()]
+            )
+
+    async def delete_many(self, keys: Sequence[str]) -> None:
+        if keys:
+            await self._execute([("DEL", *keys)])
+
+    async def incr(self, key: str) -> int:
+        [value] = await self._execute([("INCR", key)])
+        return value
+
+    async def close(self) -> None:
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+    async def _execute(self, commands: List[Tuple[Any, ...]]) -> List[Any]:
+        async with self._slots:
+            if self._idle:
+                connection = self._idle.pop()
+            else:
+                connection = await self._connect()
+            # Whether every reply was read, leaving the connection in step
+            # with the server so the next caller can reuse it
+            in_step = False
+            try:
+                replies = await asyncio.wait_for(
+                    self._pipeline(connection, commands), self.timeout
+                )
+                in_step = True
+            except RedisReplyError:
+                in_step = True
+                raise
+            except (
+                OSError,
+                asyncio.TimeoutError,
+                asyncio.IncompleteReadError,
+                CacheBackendError,
+            ) as e:
+                raise CacheBackendError(f"Redis unavailable: {e!r}") from e
+            finally:
+                # Anything else, cancellation included, may have left it
+                # half-way through a reply; drop it
+                if in_step:
+                    self._idle.append(connection)
+                else:
+                    connection[1].close()
+            return replies
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        setup = []
+        if self.password:
+            setup.append(("AUTH", self.password))
+        if self.db:
+            setup.append(("SELECT", self.db))
+        connection = None
+        ready = False
+        try:
+            connection = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.port), self.timeout
+            )
+            if setup:
+                await asyncio.wait_for(self._pipeline(connection, setup), self.timeout)
+            ready = True
+        except (
+            OSError,
+            asyncio.TimeoutError,
+            asyncio.IncompleteReadError,
+            CacheBackendError,
+        ) as e:
+            raise CacheBackendError(f"Redis unavailable: {e!r}") from e
+        finally:
+            if connection is not None and not ready:
+                connection[1].close()
+        return connection
+
+    @staticmethod
+    async def _pipeline(
+        connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter],
+        commands: List[Tuple[Any, ...]],
+    ) -> List[Any]:
+        reader, writer = connection
+        writer.write(b"".join(encode_command(*command) for command in commands))
+        await writer.drain()
+        replies, error = [], None
+        for _ in commands:
+            try:
+                replies.append(await read_reply(reader))
+            except RedisReplyError as e:
+                # Keep reading so the next caller does not get our replies
+                error = error or e
+        if error is not None:
+            raise error
+        return replies
+
+
+def create_cache_backend(
+    backend: str, url: Optional[str] = None, maxsize: int = 10000
+) -> Any:
+    if backend == "memory":
+        return MemoryBackend(maxsize)
+    if backend == "redis":
+        return RedisBackend(url or "redis://localhost:6379/0")
+    raise ValueError(f"Unknown cache backend: {backend}")
+
+
+class ModelCodec:
+    """JSON encoding of one type of value, through pydantic.
+
+    ORM rows are read through their attributes, so what comes back from the
+    cache is the matching schema rather than an ORM object.
+    """
+
+    def __init__(self, type_: Any):
+        self.adapter = TypeAdapter(type_)
+
+    def dumps(self, value: Any) -> bytes:
+        return self.adapter.dump_json(
+            self.adapter.validate_python(value, from_attributes=True)
+        )
+
+    def loads(self, data: bytes) -> Any:
+        return self.adapter.validate_json(data)
+
+
+class SharedCache:
+    """A namespace of serialized values in a cache backend.
+
+    With the Redis backend every worker shares the entries, so a value loaded
+    by one is a hit for all. A ``versioned`` namespace can be cleared at once
+    by bumping its generation, which is part of every key. Backend errors are
+    logged and treated as misses, so an unavailable cache only costs speed.
+    """
+
+    def __init__(
+        self,
+        backend: Any,
+        namespace: str,
+        codec: ModelCodec,
+        ttl: float,
+        versioned: bool = False,
+    ):
+        self.backend = backend
+        self.namespace = namespace
+        self.codec = codec
+        self.ttl = ttl
+        self.versioned = versioned
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    async def get(self, key: Hashable, default: Any = None) -> Any:
+        return (await self.get_many([key])).get(key, default)
+
+    async def get_many(self, keys: Iterable[Hashable]) -> Dict[Hashable, Any]:
+        _, found = await self._lookup(list(keys))
+        return found
+
+    async def _lookup(
+        self, keys: List[Hashable]
+    ) -> Tuple[Optional[str], Dict[Hashable, Any]]:
+        """Return the key prefix the lookup used (None if it failed) and hits"""
+        if not keys:
+            return None, {}
+        try:
+            prefix = await self._prefix()
+            values = await self.backend.get_many([prefix + _key(key) for key in keys])
+        except CacheBackendError as e:
+            self._on_error("get", e)
+            self.misses += len(keys)
+            return None, {}
+        found = {}
+        for key, value in zip(keys, values):
+            if value is None:
+                continue
+            try:
+                found[key] = self.codec.loads(value)
+            except ValueError as e:
+                # Written by a different version of the schema; load it afresh
+                self._on_error("decode", e)
+        self.hits += len(found)
+        self.misses += len(keys) - len(found)
+        return prefix, found
+
+    async def set(self, key: Hashable, value: Any) -> None:
+        await self.set_many({key: value})
+
+    async def set_many(self, items: Dict[Hashable, Any]) -> None:
+        if not items:
+            return
+        try:
+            prefix = await self._prefix()
+        except CacheBackendError as e:
+            self._on_error("set", e)
+            return
+        await self._store(prefix, items)
+
+    async def _store(self, prefix: str, items: Dict[Hashable, Any]) -> None:
+        if not items:
+            return
+        try:
+            await self.backend.set_many(
+                {
+                    prefix + _key(key): self.codec.dumps(value)
+                    for key, value in items.items()
+                },
+                self.ttl,
+            )
+        except CacheBackendError as e:
+            self._on_error("set", e)
+
+    async def delete(self, *keys: Hashable) -> None:
+        try:
+            prefix = await self._prefix()
+            await self.backend.delete_many([prefix + _key(key) for key in keys])
+        except CacheBackendError as e:
+            self._on_error("delete", e)
+
+    async def clear(self) -> None:
+        """Drop every entry of a versioned namespace, in every worker"""
+        if not self.versioned:
+            raise ValueError(f"Cache {self.namespace} is not versioned")
+        try:
+            await self.backend.incr(self._generation_key)
+        except CacheBackendError as e:
+            self._on_error("clear", e)
+
+    async def get_many_or_load(
+        self,
+        keys: Iterable[Hashable],
+        load_many: Callable[[List[Hashable]], Awaitable[Dict[Hashable, Any]]],
+    ) -> Dict[Hashable, Any]:
+        """Look ``keys`` up and load only the misses with ``load_many``.
+
+        Only values that were found are cached, so a key that does not exist
+        yet is looked up again next time rather than remembered as missing.
+        Loaded values are stored under the generation they were looked up in,
+        so a clear() while they load leaves them unreachable rather than
+        serving them as current.
+        """
+        keys = list(keys)
+        prefix, found = await self._lookup(keys)
+        missing = [key for key in keys if key not in found]
+        if missing:
+            loaded = await load_many(missing)
+            if prefix is not None:
+                await self._store(prefix, loaded)
+            found.update(loaded)
+        return found
+
+    async def get_or_load(
+        self, key: Hashable, load: Callable[[], Awaitable[Any]]
+    ) -> Any:
+        """Look ``key`` up, loading and caching it on a miss (None is not cached)"""
+
+        async def load_many(keys: List[Hashable]) -> Dict[Hashable, Any]:
+            value = await load()
+            return {} if value is None else {key: value}
+
+        return (await self.get_many_or_load([key], load_many)).get(key)
+
+    def stats(self) -> Dict[str, Any]:
+        # Counted by this worker only
+        lookups = self.hits + self.misses
+        return {
+            "backend": self.backend.name,
+            "hits": self.hits,
+            "misses": self.misses,
+            "errors": self.errors,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else None,
+        }
+
+    @property
+    def _generation_key(self) -> str:
+        return f"{self.namespace}:generation"
+
+    async def _prefix(self) -> str:
+        if not self.versioned:
+            return f"{self.namespace}:"
+        [generation] = await self.backend.get_many([self._generation_key])
+        return f"{self.namespace}:{int(generation or 0)}:"
+
+    def _on_error(self, operation: str, error: Exception) -> None:
+        self.errors += 1
+        logger.warning("Cache %s on %s failed: %s", operation, self.namespace, error)
+
+
+def _key(key: Hashable) -> str:
+    if isinstance(key, tuple):
+        return ":".join(str(part) for part in key)
+    return str(key)
@@ -0,0 +1,75 @@
+"""Concurrent-request throughput: blocking sync sessions vs AsyncSession.
+
+Runs ``concurrency`` coroutines on one event loop, each issuing a query that
+takes ``delay`` seconds on the server (``pg_sleep``). With the synchronous
+session every query blocks the loop, so the requests run one at a time and the
+wall time is roughly ``concurrency * delay``. With ``AsyncSessionLocal`` the
+queries overlap and the wall time stays close to ``delay`` (bounded by the pool
+size).
+
+Usage:
+    DATABASE_URL=postgresql://... python -m benchmarks.bench_async_db \
+        --concurrency 20 --delay 0.1
+"""
+
+import argparse
+import asyncio
+import time
+
+from sqlalchemy import text
+
+from app.database import (
+    AsyncSessionLocal,
+    SessionLocal,
+    dispose_engines,
+    get_async_engine,
+    get_engine,
+)
+
+QUERY = text("SELECT pg_sleep(:delay)")
+
+
+async def sync_request(delay: float) -> None:
+    # What the handlers did before: a blocking call inside ``async def``
+    db = SessionLocal()
+    try:
+        db.execute(QUERY, {"delay": delay})
+    finally:
+        db.close()
+
+
+async def async_request(delay: float) -> None:
+    async with AsyncSessionLocal() as session:
+        await session.execute(QUERY, {"delay": delay})
+
+
+async def run(mode: str, concurrency: int, delay: float) -> float:
+    request = sync_request if mode == "sync" else async_request
+    # Warm up the pool so connection setup is not measured
+    await asyncio.gather(*(request(0) for _ in range(concurrency)))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(request(delay) for _ in range(concurrency)))
+    return time.perf_counter() - start
+
+
+async def main(concurrency: int, delay: float) -> None:
+    get_engine()
+    get_async_engine()
+    print(f"concurrency={concurrency} delay={delay}s")
+    for mode in ("sync", "async"):
+        elapsed = await run(mode, concurrency, delay)
+        print(
+            f"{mode:>5}: {elapsed:.3f}s wall, "
+            f"{concurrency / elapsed:.1f} req/s "
+            f"(serial bound {concurrency * delay:.3f}s)"
+        )
+    await dispose_engines()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--delay", type=float, default=0.1)
+    args = parser.parse_args()
+    asyncio.run(main(args.concurrency, args.delay))
@@ -0,0 +1,139 @@
+"""Per-item cost of serializing a page of books: old path vs new path.
+
+Every path runs through a real FastAPI app over an in-process ASGI transport,
+with ``--items`` transient ``Book`` rows standing in for a query result, so no
+database is needed.
+
+- before: the service validates each row into ``Book`` and the endpoint
+  returns an untyped ``items: List[Any]`` page, encoded through
+  ``JSONResponse`` (``json.dumps`` of a dict). This is how FastAPI before
+  0.130, the old dependency floor, encodes every response.
+- after: a typed ``PaginatedResponse[Book]`` returned through its
+  response_model, which FastAPI 0.130 and later write straight to JSON bytes
+  with pydantic-core (its ``dump_json`` fast path). This fast path is where
+  the gain comes from, and is why the app requires ``fastapi>=0.130``.
+- untyped-fast: the untyped page on the same fast path, for reference, to
+  separate the fast path's share from the typed items' share.
+
+Usage:
+    python -m benchmarks.bench_serialization --items 1000 --repeat 50
+"""
+
+import argparse
+import asyncio
+import time
+from typing import Any, List, Optional
+
+import fastapi
+import httpx
+from fastapi import FastAPI
+from fastapi.responses import JSONResponse
+from pydantic import BaseModel
+
+from app.models import Author, Book
+from app.schemas import Book as BookSchema, PaginatedResponse
+
+
+class UntypedPaginatedResponse(BaseModel):
+    # The page model as it was before it became generic
+    items: List[Any]
+    total: Optional[int] = None
+    page: int
+    size: int
+    pages: Optional[int] = None
+    count_type: str = "exact"
+
+
+def make_rows(count: int) -> List[Book]:
+    author = Author(id=1, name="Test Author", bio="Bio", version=1)
+    return [
+        Book(
+            id=i,
+            title=f"Book {i}",
+            isbn=f"{i:010d}",
+            author_id=1,
+            author=author,
+            description="A description " * 8,
+            publisher="Test Publisher",
+            published_date="2023-01-01",
+            version=1,
+        )
+        for i in range(1, count + 1)
+    ]
+
+
+def make_app(rows: List[Book]) -> FastAPI:
+    app = FastAPI()
+
+    def untyped_page() -> UntypedPaginatedResponse:
+        return UntypedPaginatedResponse(
+            items=[BookSchema.model_validate(row) for row in rows],
+            total=len(rows),
+            page=1,
+            size=len(rows),
+            pages=1,
+        )
+
+    @app.get(
+        "/before",
+        response_model=UntypedPaginatedResponse,
+        response_class=JSONResponse,
+    )
+    async def before():
+        return untyped_page()
+
+    @app.get("/untyped-fast", response_model=UntypedPaginatedResponse)
+    async def untyped_fast():
+        return untyped_page()
+
+    @app.get("/after", response_model=PaginatedResponse[BookSchema])
+    async def after():
+        return PaginatedResponse[BookSchema](
+            items=[BookSchema.model_validate(row) for row in rows],
+            total=len(rows),
+            page=1,
+            size=len(rows),
+            pages=1,
+        )
+
+    return app
+
+
+async def measure(client: httpx.AsyncClient, path: str, repeat: int) -> float:
+    # One warm-up request so schema and serializer setup is not measured
+    body = (await client.get(path)).content
+    start = time.perf_counter()
+    for _ in range(repeat):
+        response = await client.get(path)
+        assert response.content == body
+    return (time.perf_counter() - start) / repeat
+
+
+async def main(items: int, repeat: int) -> None:
+    app = make_app(make_rows(items))
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(
+        transport=transport, base_url="http://bench"
+    ) as client:
+        expected = (await client.get("/after")).json()
+        for path in ("/before", "/untyped-fast"):
+            assert (await client.get(path)).json() == expected
+
+        print(f"fastapi={fastapi.__version__} items={items} repeat={repeat}")
+        results = {}
+        for path in ("/before", "/after", "/untyped-fast"):
+            elapsed = await measure(client, path, repeat)
+            results[path] = elapsed
+            print(
+                f"{path:>13}: {elapsed * 1000:.2f} ms/page, "
+                f"{elapsed / items * 1e6:.2f} us/item"
+            )
+        print(f"speedup vs /before: {results['/before'] / results['/after']:.2f}x")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=50)
+    args = parser.parse_args()
+    asyncio.run(main(args.items, args.repeat))
@@ -0,0 +1,78 @@
+"""Cold-start cost: importing app.main and serving the first request.
+
+Each run is a fresh interpreter, so every module is imported from scratch. A
+run measures:
+
+- import: ``import app.main``
+- startup: the lifespan startup (engines, HTTP client, caches)
+- first request: the first ``GET <path>`` through an in-process ASGI transport
+
+The default path, ``/``, needs no database. Pass a path such as ``/books/`` to
+include opening the first database connection.
+
+Usage:
+    python -m benchmarks.bench_startup --runs 10 --path /
+"""
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+
+CHILD = """
+import asyncio, json, sys, time
+
+start = time.perf_counter()
+import app.main
+imported = time.perf_counter()
+
+import httpx
+
+
+async def first_request(path):
+    async with app.main.app.router.lifespan_context(app.main.app):
+        started = time.perf_counter()
+        transport = httpx.ASGITransport(app=app.main.app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            response = await client.get(path)
+        return started, time.perf_counter(), response.status_code
+
+
+started, done, status = asyncio.run(first_request(sys.argv[1]))
+print(json.dumps({
+    "import": imported - start,
+    "startup": started - imported,
+    "first_request": done - started,
+    "status": status,
+}))
+"""
+
+
+def run_once(path: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, "-c", CHILD, path],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def main(runs: int, path: str) -> None:
+    results = [run_once(path) for _ in range(runs)]
+    print(f"runs={runs} path={path} status={results[-1]['status']}")
+    for phase in ("import", "startup", "first_request"):
+        timings = [result[phase] * 1000 for result in results]
+        print(
+            f"{phase:>13}: median {statistics.median(timings):.1f} ms, "
+            f"min {min(timings):.1f} ms, max {max(timings):.1f} ms"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=10)
+    parser.add_argument("--path", default="/")
+    args = parser.parse_args()
+    main(args.runs, args.path)
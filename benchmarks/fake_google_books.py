@@ -0,0 +1,122 @@
+"""Local stand-in for the Google Books volumes API.
+
+Answers ``GET /books/v1/volumes`` with generated volumes after an injectable
+delay, and fails a configurable fraction of requests with 429/503. Point the
+app at it with ``GOOGLE_BOOKS_BASE_URL=http://127.0.0.1:<port>/books/v1/volumes``.
+
+Usage:
+    python -m benchmarks.fake_google_books --port 8081 --latency 0.05 \
+        --jitter 0.02 --error-rate 0.01
+"""
+
+import argparse
+import asyncio
+import hashlib
+import random
+import threading
+import time
+from typing import Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+
+def make_volume(query: str, index: int) -> dict:
+    digest = hashlib.sha1(f"{query}:{index}".encode()).hexdigest()
+    isbn = str(int(digest[:12], 16))[:13].rjust(13, "9")
+    return {
+        "id": digest[:12],
+        "volumeInfo": {
+            "title": f"Volume {index} for {query}",
+            "authors": [f"Author {digest[12:16]}"],
+            "description": "Generated by the fake Google Books server",
+            "industryIdentifiers": [{"type": "ISBN_13", "identifier": isbn}],
+            "publishedDate": "2020-01-01",
+            "publisher": "Fake Publisher",
+        },
+    }
+
+
+def create_app(
+    latency: float = 0.05,
+    jitter: float = 0.0,
+    error_rate: float = 0.0,
+    seed: Optional[int] = None,
+) -> Starlette:
+    rng = random.Random(seed)
+    stats = {"requests": 0, "errors": 0}
+
+    async def volumes(request: Request) -> JSONResponse:
+        stats["requests"] += 1
+        delay = max(0.0, latency + rng.uniform(-jitter, jitter))
+        if delay:
+            await asyncio.sleep(delay)
+        if rng.random() < error_rate:
+            stats["errors"] += 1
+            status = rng.choice((429, 503))
+            return JSONResponse(
+                {"error": {"code": status}},
+                status_code=status,
+                headers={"Retry-After": "0"},
+            )
+        query = request.query_params.get("q", "")
+        max_results = min(int(request.query_params.get("maxResults", "10")), 40)
+        items = [make_volume(query, index) for index in range(max_results)]
+        return JSONResponse({"totalItems": len(items), "items": items})
+
+    async def get_stats(request: Request) -> JSONResponse:
+        return JSONResponse(stats)
+
+    app = Starlette(
+        routes=[
+            Route("/books/v1/volumes", volumes),
+            Route("/stats", get_stats),
+        ]
+    )
+    app.state.stats = stats
+    return app
+
+
+class BackgroundServer:
+    """Runs an ASGI app with uvicorn on a background thread"""
+
+    def __init__(self, app: Starlette, host: str = "127.0.0.1", port: int = 0):
+        config = uvicorn.Config(app, host=host, port=port, log_level="warning")
+        self.server = uvicorn.Server(config)
+        self.thread = threading.Thread(target=self.server.run, daemon=True)
+
+    @property
+    def port(self) -> int:
+        return self.server.servers[0].sockets[0].getsockname()[1]
+
+    def __enter__(self) -> "BackgroundServer":
+        self.thread.start()
+        while not self.server.started:
+            if not self.thread.is_alive():
+                raise RuntimeError("Fake Google Books server failed to start")
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.server.should_exit = True
+        self.thread.join()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--jitter", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+    uvicorn.run(
+        create_app(args.latency, args.jitter, args.error_rate, args.seed),
+        host=args.host,
+        port=args.port,
+        log_level="warning",
+    )
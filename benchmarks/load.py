@@ -0,0 +1,291 @@
+"""Load test: per-endpoint latency percentiles and throughput, as JSON.
+
+Drives the app with ``--concurrency`` closed-loop workers per endpoint and
+reports p50/p95/p99 latency, throughput and error counts. By default the app
+runs in-process (its lifespan included) and Google Books calls go to a local
+fake server (benchmarks.fake_google_books) with injectable latency and error
+rate. With ``--base-url`` an already running server is targeted instead; start
+the fake server separately and point that server at it.
+
+The app needs a migrated database (``DATABASE_URL``). Authors and books are
+seeded through the API first. Google Books calls go through the app's client
+side rate limiter, so raise ``GOOGLE_BOOKS_RATE_LIMIT`` to measure the app
+rather than the limiter.
+
+Usage:
+    python -m benchmarks.load --concurrency 20 --requests 500 \
+        --google-latency 0.05 --google-error-rate 0.01 --output after.json
+    python -m benchmarks.load --compare before.json --output after.json
+"""
+
+import argparse
+import asyncio
+import contextlib
+import json
+import os
+import random
+import statistics
+import subprocess
+import sys
+import time
+from typing import Any, Awaitable, Dict, List, Optional
+
+import httpx
+
+from benchmarks.fake_google_books import BackgroundServer, create_app
+
+ENDPOINTS = ("list_books", "get_book", "list_authors", "create_book", "google_search")
+
+
+class Scenario:
+    """Requests for each endpoint, built around the seeded data"""
+
+    def __init__(self, author_ids: List[int], book_ids: List[int], query_pool: int):
+        self.author_ids = author_ids
+        self.book_ids = book_ids
+        self.query_pool = query_pool
+        # ISBNs must be unique across runs against the same database
+        self.isbn_prefix = f"{random.randrange(10_000):04d}"
+        self.created = 0
+
+    def request(self, client: httpx.AsyncClient, endpoint: str, i: int) -> Awaitable:
+        if endpoint == "list_books":
+            return client.get("/books/", params={"page": i % 5 + 1, "size": 20})
+        if endpoint == "get_book":
+            return client.get(f"/books/{random.choice(self.book_ids)}")
+        if endpoint == "list_authors":
+            return client.get("/authors/", params={"cursor": "", "size": 20})
+        if endpoint == "create_book":
+            self.created += 1
+            return client.post("/books/", json=self.new_book(f"Load {self.created}"))
+        if endpoint == "google_search":
+            query = f"subject:load{i % self.query_pool}"
+            return client.get("/google-books/search", params={"query": query})
+        raise ValueError(f"Unknown endpoint: {endpoint}")
+
+    def new_book(self, title: str) -> Dict[str, Any]:
+        return {
+            "title": title,
+            "isbn": f"{self.isbn_prefix}{len(self.book_ids) + self.created:09d}",
+            "author_id": random.choice(self.author_ids),
+        }
+
+
+async def seed(
+    client: httpx.AsyncClient, authors: int, books: int, query_pool: int
+) -> Scenario:
+    author_ids = []
+    for i in range(authors):
+        response = await client.post("/authors/", json={"name": f"Load Author {i}"})
+        response.raise_for_status()
+        author_ids.append(response.json()["id"])
+
+    scenario = Scenario(author_ids, [], query_pool)
+    for i in range(books):
+        response = await client.post("/books/", json=scenario.new_book(f"Seed {i}"))
+        response.raise_for_status()
+        scenario.book_ids.append(response.json()["id"])
+    return scenario
+
+
+def summarize(latencies: List[float], errors: int, elapsed: float) -> Dict[str, Any]:
+    timings = sorted(latency * 1000 for latency in latencies)
+    cuts = statistics.quantiles(timings, n=100, method="inclusive")
+    return {
+        "requests": len(timings),
+        "errors": errors,
+        "throughput_rps": round(len(timings) / elapsed, 2),
+        "latency_ms": {
+            "p50": round(cuts[49], 3),
+            "p95": round(cuts[94], 3),
+            "p99": round(cuts[98], 3),
+            "mean": round(statistics.fmean(timings), 3),
+            "max": round(timings[-1], 3),
+        },
+    }
+
+
+async def run_endpoint(
+    client: httpx.AsyncClient,
+    scenario: Scenario,
+    endpoint: str,
+    requests: int,
+    concurrency: int,
+    warmup: int,
+) -> Dict[str, Any]:
+    for i in range(warmup):
+        await scenario.request(client, endpoint, i)
+
+    latencies: List[float] = []
+    errors = 0
+    issued = 0
+
+    async def worker() -> None:
+        nonlocal errors, issued
+        while issued < requests:
+            i = issued
+            issued += 1
+            start = time.perf_counter()
+            try:
+                response = await scenario.request(client, endpoint, i)
+                failed = response.status_code >= 400
+            except httpx.HTTPError:
+                failed = True
+            latencies.append(time.perf_counter() - start)
+            errors += failed
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return summarize(latencies, errors, time.perf_counter() - start)
+
+
+@contextlib.asynccontextmanager
+async def in_process_client():
+    # Imported here so the environment prepared by main() is what it reads
+    from app.main import app
+
+    async with app.router.lifespan_context(app):
+        # Unhandled errors become 500s, as they would behind a real server
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        async with httpx.AsyncClient(
+            transport=transport, base_url="http://load"
+        ) as client:
+            yield client
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            check=True,
+            capture_output=True,
+            text=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def run(args: argparse.Namespace) -> Dict[str, Any]:
+    if args.base_url:
+        client_context = httpx.AsyncClient(base_url=args.base_url, timeout=30)
+    else:
+        client_context = in_process_client()
+
+    async with client_context as client:
+        scenario = await seed(
+            client, args.seed_authors, args.seed_books, args.google_query_pool
+        )
+        results = {}
+        for endpoint in args.endpoints:
+            results[endpoint] = await run_endpoint(
+                client,
+                scenario,
+                endpoint,
+                args.requests,
+                args.concurrency,
+                args.warmup,
+            )
+            print(format_result(endpoint, results[endpoint]), file=sys.stderr)
+
+    return {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+            "target": args.base_url or "in-process",
+            "concurrency": args.concurrency,
+            "requests": args.requests,
+            "google_latency": args.google_latency,
+            "google_jitter": args.google_jitter,
+            "google_error_rate": args.google_error_rate,
+        },
+        "results": results,
+    }
+
+
+def format_result(endpoint: str, result: Dict[str, Any]) -> str:
+    latency = result["latency_ms"]
+    return (
+        f"{endpoint:>14}: {result['throughput_rps']:>8.1f} req/s  "
+        f"p50 {latency['p50']:>8.2f}  p95 {latency['p95']:>8.2f}  "
+        f"p99 {latency['p99']:>8.2f} ms  errors {result['errors']}"
+    )
+
+
+def compare(baseline: Dict[str, Any], current: Dict[str, Any]) -> None:
+    def change(before: float, after: float) -> str:
+        return f"{(after - before) / before * 100:+.1f}%" if before else "n/a"
+
+    print(
+        f"vs {baseline['meta'].get('revision') or 'baseline'}:",
+        file=sys.stderr,
+    )
+    for endpoint, result in current["results"].items():
+        previous = baseline["results"].get(endpoint)
+        if previous is None:
+            continue
+        print(
+            f"{endpoint:>14}: throughput "
+            f"{change(previous['throughput_rps'], result['throughput_rps'])}, "
+            f"p95 {change(previous['latency_ms']['p95'], result['latency_ms']['p95'])}, "
+            f"p99 {change(previous['latency_ms']['p99'], result['latency_ms']['p99'])}",
+            file=sys.stderr,
+        )
+
+
+def main(args: argparse.Namespace) -> None:
+    with contextlib.ExitStack() as stack:
+        if not args.base_url:
+            fake = stack.enter_context(
+                BackgroundServer(
+                    create_app(
+                        args.google_latency,
+                        args.google_jitter,
+                        args.google_error_rate,
+                        args.seed,
+                    )
+                )
+            )
+            os.environ["GOOGLE_BOOKS_BASE_URL"] = (
+                f"http://127.0.0.1:{fake.port}/books/v1/volumes"
+            )
+            os.environ.setdefault("GOOGLE_BOOKS_API_KEY", "load-test")
+        report = asyncio.run(run(args))
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as file:
+            file.write(output + "\n")
+    else:
+        print(output)
+    if args.compare:
+        with open(args.compare) as file:
+            compare(json.load(file), report)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--base-url", default=None)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--warmup", type=int, default=10)
+    parser.add_argument(
+        "--endpoints",
+        nargs="+",
+        choices=ENDPOINTS,
+        default=list(ENDPOINTS),
+    )
+    parser.add_argument("--seed-authors", type=int, default=20)
+    parser.add_argument("--seed-books", type=int, default=200)
+    parser.add_argument("--google-latency", type=float, default=0.05)
+    parser.add_argument("--google-jitter", type=float, default=0.01)
+    parser.add_argument("--google-error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--google-query-pool",
+        type=int,
+        default=50,
+        help="Distinct search queries, i.e. how much the response cache can help",
+    )
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--output", default=None, help="Write the JSON report here")
+    parser.add_argument("--compare", default=None, help="Baseline JSON report")
+    main(parser.parse_args())
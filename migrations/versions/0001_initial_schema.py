@@ -0,0 +1,41 @@
+"""initial schema
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "authors",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("name", sa.String(), nullable=True),
+        sa.Column("bio", sa.String(), nullable=True),
+    )
+    op.create_index("ix_authors_id", "authors", ["id"])
+    op.create_index("ix_authors_name", "authors", ["name"])
+
+    op.create_table(
+        "books",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("isbn", sa.String(), nullable=True),
+        sa.Column("author_id", sa.Integer(), sa.ForeignKey("authors.id")),
+    )
+    op.create_index("ix_books_id", "books", ["id"])
+    op.create_index("ix_books_title", "books", ["title"])
+    op.create_index("ix_books_isbn", "books", ["isbn"], unique=True)
+
+
+def downgrade() -> None:
+    op.drop_table("books")
+    op.drop_table("authors")
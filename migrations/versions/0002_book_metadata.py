@@ -0,0 +1,26 @@
+"""book metadata columns filled in from Google Books
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0002"
+down_revision = "0001"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("books", sa.Column("description", sa.String(), nullable=True))
+    op.add_column("books", sa.Column("publisher", sa.String(), nullable=True))
+    op.add_column("books", sa.Column("published_date", sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("books", "published_date")
+    op.drop_column("books", "publisher")
+    op.drop_column("books", "description")
@@ -0,0 +1,44 @@
+"""full-text and trigram search indexes
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.execute("CREATE EXTENSION IF NOT EXISTS pg_trgm")
+    op.create_index(
+        "ix_books_title_fts",
+        "books",
+        [sa.text("to_tsvector('english'::regconfig, title)")],
+        postgresql_using="gin",
+    )
+    op.create_index(
+        "ix_books_title_trgm",
+        "books",
+        ["title"],
+        postgresql_using="gin",
+        postgresql_ops={"title": "gin_trgm_ops"},
+    )
+    op.create_index(
+        "ix_authors_name_trgm",
+        "authors",
+        ["name"],
+        postgresql_using="gin",
+        postgresql_ops={"name": "gin_trgm_ops"},
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_authors_name_trgm", table_name="authors")
+    op.drop_index("ix_books_title_trgm", table_name="books")
+    op.drop_index("ix_books_title_fts", table_name="books")
@@ -0,0 +1,32 @@
+"""persistent Google Books ISBN cache
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "google_books_cache",
+        sa.Column("isbn", sa.String(), primary_key=True),
+        sa.Column("volume_id", sa.String(), nullable=True),
+        sa.Column("title", sa.String(), nullable=True),
+        sa.Column("authors", sa.JSON(), nullable=True),
+        sa.Column("description", sa.String(), nullable=True),
+        sa.Column("published_date", sa.String(), nullable=True),
+        sa.Column("publisher", sa.String(), nullable=True),
+        sa.Column("fetched_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("google_books_cache")
@@ -0,0 +1,128 @@
+"""In-memory stand-in for a Redis server, for tests without Redis.
+
+Speaks enough of the Redis protocol (RESP2) for the shared cache: PING, GET,
+MGET, SET with EX/PX, DEL, INCR, SELECT, AUTH and FLUSHDB. Tests get one
+through the ``redis_server`` fixture.
+"""
+
+import asyncio
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+
+def encode_reply(value: Any) -> bytes:
+    if value is None:
+        return b"$-1\r\n"
+    if isinstance(value, str):
+        return f"+{value}\r\n".encode()
+    if isinstance(value, int):
+        return f":{value}\r\n".encode()
+    if isinstance(value, bytes):
+        return b"$%d\r\n%s\r\n" % (len(value), value)
+    if isinstance(value, list):
+        return f"*{len(value)}\r\n".encode() + b"".join(map(encode_reply, value))
+    raise TypeError(f"Cannot encode {value!r}")
+
+
+class FakeRedisServer:
+    """In-memory RESP server; use as ``async with FakeRedisServer() as server``"""
+
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        self.host = host
+        self.port = port
+        self.data: Dict[bytes, Tuple[bytes, Optional[float]]] = {}
+        self.commands = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"redis://{self.host}:{self.port}/0"
+
+    async def start(self) -> None:
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "FakeRedisServer":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    async def _handle(
+        self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter
+    ) -> None:
+        try:
+            while True:
+                command = await self._read_command(reader)
+                self.commands += 1
+                try:
+                    reply = encode_reply(self.execute(command))
+                except ValueError as e:
+                    reply = f"-ERR {e}\r\n".encode()
+                writer.write(reply)
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    async def _read_command(reader: asyncio.StreamReader) -> List[bytes]:
+        header = await reader.readuntil(b"\r\n")
+        if not header.startswith(b"*"):
+            raise ConnectionError("Inline commands are not supported")
+        args = []
+        for _ in range(int(header[1:-2])):
+            length = int((await reader.readuntil(b"\r\n"))[1:-2])
+            args.append((await reader.readexactly(length + 2))[:-2])
+        return args
+
+    def _get(self, key: bytes) -> Optional[bytes]:
+        entry = self.data.get(key)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.monotonic():
+            del self.data[key]
+            return None
+        return value
+
+    def execute(self, command: List[bytes]) -> Any:
+        name, args = command[0].upper(), command[1:]
+        if name == b"PING":
+            return "PONG"
+        if name in (b"SELECT", b"AUTH"):
+            return "OK"
+        if name == b"GET":
+            return self._get(args[0])
+        if name == b"MGET":
+            return [self._get(key) for key in args]
+        if name == b"SET":
+            expires_at = None
+            if len(args) == 4 and args[2].upper() in (b"EX", b"PX"):
+                seconds = int(args[3]) / (1000 if args[2].upper() == b"PX" else 1)
+                expires_at = time.monotonic() + seconds
+            elif len(args) != 2:
+                raise ValueError("unsupported SET options")
+            self.data[args[0]] = (args[1], expires_at)
+            return "OK"
+        if name == b"DEL":
+            return sum(self.data.pop(key, None) is not None for key in args)
+        if name == b"INCR":
+            try:
+                value = int(self._get(args[0]) or 0) + 1
+            except ValueError:
+                raise ValueError("value is not an integer or out of range")
+            self.data[args[0]] = (str(value).encode(), None)
+            return value
+        if name == b"FLUSHDB":
+            self.data.clear()
+            return "OK"
+        raise ValueError(f"unknown command '{name.decode()}'")
@@ -1,35 +1,111 @@
+import json
 import pytest
-from app.schemas import Author
+from fastapi import HTTPException
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.repositories.author_repository import AuthorRepository
+from app.schemas import Author, AuthorCreate
 
 
-def test_create_author(author_service):
-    author = author_service.create_author("Test Author", "Test Bio")
+@pytest.mark.asyncio
+async def test_create_author(author_service):
+    author = await author_service.create_author("Test Author", "Test Bio")
     assert isinstance(author, Author)
     assert author.name == "Test Author"
     assert author.bio == "Test Bio"
 
 
-def test_get_all_authors(author_service):
+@pytest.mark.asyncio
+async def test_create_authors_batch(author_service):
+    authors = await author_service.create_authors(
+        [AuthorCreate(name=f"Author {i}") for i in range(3)]
+    )
+    assert [author.name for author in authors] == ["Author 0", "Author 1", "Author 2"]
+    assert len({author.id for author in authors}) == 3
+
+    author_service.max_batch_size = 2
+    with pytest.raises(HTTPException) as exc_info:
+        await author_service.create_authors(
+            [AuthorCreate(name=f"Author {i}") for i in range(3)]
+        )
+    assert exc_info.value.status_code == 400
+
+
+@pytest.mark.asyncio
+async def test_get_all_authors(author_service):
     # Create test authors
-    author_service.create_author("Author 1")
-    author_service.create_author("Author 2")
+    await author_service.create_author("Author 1")
+    await author_service.create_author("Author 2")
 
-    authors = author_service.get_all_authors()
+    authors = await author_service.get_all_authors()
     assert len(authors) == 2
     assert all(isinstance(author, Author) for author in authors)
     assert {author.name for author in authors} == {"Author 1", "Author 2"}
 
 
-def test_get_author(author_service):
-    created_author = author_service.create_author("Test Author")
-    retrieved_author = author_service.get_author(created_author.id)
+@pytest.mark.asyncio
+async def test_get_author(author_service):
+    created_author = await author_service.create_author("Test Author")
+    retrieved_author = await author_service.get_author(created_author.id)
 
     assert isinstance(retrieved_author, Author)
     assert retrieved_author.id == created_author.id
     assert retrieved_author.name == "Test Author"
 
 
-def test_get_nonexistent_author(author_service):
+@pytest.mark.asyncio
+async def test_get_nonexistent_author(author_service):
     with pytest.raises(Exception) as exc_info:
-        author_service.get_author(999)
+        await author_service.get_author(999)
     assert "Author not found" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_get_authors_by_cursor(author_service):
+    for i in range(3):
+        await author_service.create_author(f"Author {i}")
+
+    first = await author_service.get_authors_by_cursor(size=2)
+    assert [author.name for author in first.items] == ["Author 2", "Author 1"]
+    assert first.next_cursor is not None
+
+    second = await author_service.get_authors_by_cursor(
+        cursor=first.next_cursor, size=2
+    )
+    assert [author.name for author in second.items] == ["Author 0"]
+    assert second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_stream_authors(author_service):
+    for i in range(5):
+        await author_service.create_author(f"Author {i}")
+
+    chunks = [chunk async for chunk in author_service.stream_authors(batch_size=2)]
+    authors = json.loads("".join(chunks))
+
+    # Opening and closing brackets plus one chunk per batch of two
+    assert len(chunks) == 5
+    assert [author["name"] for author in authors] == [f"Author {i}" for i in range(5)]
+
+
+@pytest.mark.asyncio
+async def test_stream_authors_empty(author_service):
+    chunks = [chunk async for chunk in author_service.stream_authors()]
+    assert json.loads("".join(chunks)) == []
+
+
+@pytest.mark.asyncio
+async def test_reads_go_to_the_replica_until_the_repository_writes(db_session):
+    # A session on its own connection cannot see the test's open transaction,
+    # so it behaves like a replica that has not caught up yet
+    replica = AsyncSession(bind=db_session.bind.engine)
+    try:
+        repository = AuthorRepository(db_session, read_db=replica)
+        unreplicated = await AuthorRepository(db_session).create("Not replicated")
+        assert await repository.get_by_id(unreplicated.id) is None
+
+        created = await repository.create("Written here")
+        fetched = await repository.get_by_id(created.id)
+        assert fetched.name == "Written here"
+    finally:
+        await replica.close()
@@ -0,0 +1,67 @@
+import csv
+import gzip
+import io
+import json
+import pytest
+from fastapi import HTTPException
+from app.services.book_export_service import BookExportService
+
+
+async def collect(chunks):
+    return [chunk async for chunk in chunks]
+
+
+@pytest.fixture
+async def books(author_repository, book_repository):
+    author = await author_repository.create("Export Author", "Bio")
+    for i in range(5):
+        await book_repository.create(f"Book {i}", f"123456789{i}", author.id)
+
+
+@pytest.mark.asyncio
+async def test_export_ndjson_in_batches(book_repository, books):
+    service = BookExportService(book_repository, batch_size=2)
+
+    chunks = await collect(service.export_books("ndjson"))
+
+    # One chunk per batch read from the cursor
+    assert len(chunks) == 3
+    rows = [json.loads(line) for line in "".join(chunks).splitlines()]
+    assert [row["title"] for row in rows] == [f"Book {i}" for i in range(5)]
+    assert rows[0]["author_name"] == "Export Author"
+    assert rows[0]["author_bio"] == "Bio"
+
+
+@pytest.mark.asyncio
+async def test_export_csv_gzip(book_repository, books):
+    service = BookExportService(book_repository, batch_size=2)
+
+    chunks = await collect(service.export_books("csv", compress=True))
+
+    text = gzip.decompress(b"".join(chunks)).decode()
+    rows = list(csv.DictReader(io.StringIO(text)))
+    assert len(rows) == 5
+    assert rows[4]["isbn"] == "1234567894"
+    assert rows[4]["author_name"] == "Export Author"
+
+
+@pytest.mark.asyncio
+async def test_export_includes_books_without_an_author(book_repository, books):
+    await book_repository.create("Orphan", "9999999999", None)
+    service = BookExportService(book_repository)
+
+    rows = [
+        json.loads(line)
+        for line in "".join(await collect(service.export_books("ndjson"))).splitlines()
+    ]
+
+    assert len(rows) == 6
+    assert rows[-1]["title"] == "Orphan"
+    assert (rows[-1]["author_id"], rows[-1]["author_name"]) == (None, None)
+    assert rows[-1]["author_bio"] is None
+
+
+def test_export_unknown_format(book_repository):
+    with pytest.raises(HTTPException) as exc_info:
+        BookExportService(book_repository).export_books("xml")
+    assert exc_info.value.status_code == 400
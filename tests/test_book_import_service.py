@@ -0,0 +1,122 @@
+import asyncio
+import pytest
+from unittest.mock import AsyncMock
+from app.services.book_import_service import (
+    BookImportService,
+    iter_csv_rows,
+    iter_ndjson_rows,
+)
+
+
+async def stream(*chunks):
+    for chunk in chunks:
+        yield chunk
+
+
+async def collect(rows):
+    return [row async for row in rows]
+
+
+@pytest.mark.asyncio
+async def test_ndjson_rows_split_across_chunks():
+    rows = await collect(
+        iter_ndjson_rows(
+            stream(
+                b'{"title": "Book 1"}\n{"tit',
+                b'le": "B\xc3',
+                b'\xa9"}\n\nnot json\n[1]',
+            )
+        )
+    )
+    assert rows == [
+        (1, {"title": "Book 1"}),
+        (2, {"title": "Bé"}),
+        (3, "Invalid JSON"),
+        (4, "Expected a JSON object"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_csv_rows_with_quoted_newlines():
+    rows = await collect(
+        iter_csv_rows(
+            stream(
+                b"title,isbn,author_id\n",
+                b'"Book, with comma",1234567890,1\n"Multi\nline",09876',
+                b"54321,2\nshort,row\n",
+            )
+        )
+    )
+    assert rows == [
+        (1, {"title": "Book, with comma", "isbn": "1234567890", "author_id": "1"}),
+        (2, {"title": "Multi\nline", "isbn": "0987654321", "author_id": "2"}),
+        (3, "Expected 3 columns, got 2"),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_import_books_reports_row_errors(author_repository, book_repository):
+    author = await author_repository.create("Test Author")
+    await book_repository.create("Existing Book", "1111111111", author.id)
+    service = BookImportService(book_repository, author_repository, batch_size=2)
+
+    rows = [
+        (1, {"title": "Book 1", "isbn": "1234567890", "author_id": author.id}),
+        (2, {"title": "Book 2", "isbn": "0987654321", "author_id": str(author.id)}),
+        (3, {"title": "Book 3", "isbn": "1111111111", "author_id": author.id}),
+        (4, {"title": "Book 4", "isbn": "2222222222", "author_id": 999}),
+        (5, {"title": "", "isbn": "3333333333", "author_id": author.id}),
+        (6, {"title": "Book 6", "isbn": "1234567890", "author_id": author.id}),
+        (7, "Invalid JSON"),
+    ]
+
+    async def iter_rows():
+        for row in rows:
+            yield row
+
+    result = await service.import_books(iter_rows())
+
+    assert (result.total, result.imported, result.failed) == (7, 2, 5)
+    assert [(error.row, error.detail) for error in result.errors] == [
+        (3, "ISBN already exists"),
+        (4, "Author not found"),
+        (5, "title: String should have at least 1 character"),
+        (6, "ISBN already exists"),
+        (7, "Invalid JSON"),
+    ]
+    _, total, _ = await book_repository.get_all()
+    assert total == 3
+
+
+@pytest.mark.asyncio
+async def test_concurrent_imports_keep_separate_counts():
+    author_repository = AsyncMock()
+    author_repository.get_existing_ids.return_value = {1}
+    book_repository = AsyncMock()
+
+    async def bulk_create(books):
+        await asyncio.sleep(0)
+        return {book["isbn"] for book in books}
+
+    book_repository.bulk_create.side_effect = bulk_create
+    service = BookImportService(book_repository, author_repository, batch_size=1)
+
+    async def iter_rows(count, bad_rows):
+        for i in range(1, count + 1):
+            yield i, (
+                "Invalid JSON"
+                if i in bad_rows
+                else {
+                    "title": f"Book {i}",
+                    "isbn": f"{count}{i:09d}",
+                    "author_id": 1,
+                }
+            )
+            await asyncio.sleep(0)
+
+    first, second = await asyncio.gather(
+        service.import_books(iter_rows(3, {2})), service.import_books(iter_rows(5, ()))
+    )
+
+    assert (first.total, first.imported, first.failed) == (3, 2, 1)
+    assert (second.total, second.imported, second.failed) == (5, 5, 0)
@@ -1,6 +1,15 @@
 import pytest
-from app.schemas import Book, PaginatedResponse, GoogleBook
+from contextlib import contextmanager
+from fastapi import HTTPException
+from sqlalchemy import event
+from app.schemas import Book, PaginatedResponse, CursorPaginatedResponse, GoogleBook
 from unittest.mock import AsyncMock, patch
+from app.cache import TTLCache
+from app.etag import book_collection_etag, book_etag
+from app.repositories.book_repository import BookRepository
+from app.services.book_service import BookService
+from app.shared_cache import MemoryBackend, ModelCodec, SharedCache
+from typing import List, Optional, Tuple
 
 # Mock response data
 MOCK_GOOGLE_BOOKS_RESPONSE = {
@@ -102,7 +111,7 @@ def mock_google_books_repository():
 @pytest.mark.asyncio
 async def test_create_book(book_service, author_service):
     # First create an author
-    author = author_service.create_author("Test Author")
+    author = await author_service.create_author("Test Author")
 
     # Then create a book
     book = await book_service.create_book("Test Book", "1234567890", author.id)
@@ -112,6 +121,32 @@ async def test_create_book(book_service, author_service):
     assert book.author_id == author.id
 
 
+@pytest.mark.asyncio
+async def test_create_book_duplicate_isbn(book_service, author_service):
+    author = await author_service.create_author("Test Author")
+    await book_service.create_book("Test Book", "1234567890", author.id)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await book_service.create_book("Other Book", "1234567890", author.id)
+    assert exc_info.value.status_code == 409
+
+
+@pytest.mark.asyncio
+async def test_upsert_book_is_idempotent(book_service, author_service):
+    author = await author_service.create_author("Test Author")
+
+    created = await book_service.upsert_book("Test Book", "1234567890", author.id)
+    repeated = await book_service.upsert_book("Test Book", "1234567890", author.id)
+    assert repeated.id == created.id
+    assert repeated.version == created.version == 1
+
+    renamed = await book_service.upsert_book("New Title", "1234567890", author.id)
+    assert renamed.id == created.id
+    assert renamed.title == "New Title"
+    assert renamed.version == 2
+    assert renamed.author.name == "Test Author"
+
+
 @pytest.mark.asyncio
 async def test_create_book_nonexistent_author(book_service):
     with pytest.raises(Exception) as exc_info:
@@ -122,12 +157,12 @@ async def test_create_book_nonexistent_author(book_service):
 @pytest.mark.asyncio
 async def test_get_all_books(book_service, author_service):
     # Create test data
-    author = author_service.create_author("Test Author")
+    author = await author_service.create_author("Test Author")
     await book_service.create_book("Book 1", "1234567890", author.id)
     await book_service.create_book("Book 2", "0987654321", author.id)
 
     # Test pagination
-    result = book_service.get_all_books(page=1, size=2)
+    result = await book_service.get_all_books(page=1, size=2)
     assert isinstance(result, PaginatedResponse)
     assert len(result.items) == 2
     assert result.total == 2
@@ -136,22 +171,198 @@ async def test_get_all_books(book_service, author_service):
     assert result.pages == 1
 
 
+@contextmanager
+def count_queries(session):
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, *args):
+        # Ignore the SAVEPOINTs the test session issues around transactions
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append(statement)
+
+    bind = session.get_bind()
+    event.listen(bind, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(bind, "before_cursor_execute", before_cursor_execute)
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("author_loading", ["joined", "selectin"])
+async def test_book_queries_do_not_grow_with_page_size(
+    db_session, author_repository, author_loading
+):
+    book_service = BookService(
+        BookRepository(db_session, author_loading=author_loading), author_repository
+    )
+    for i in range(20):
+        author = await author_repository.create(f"Author {i}")
+        await book_service.create_book(f"Book {i}", f"12345678{i:02d}", author.id)
+
+    with count_queries(db_session) as small_page:
+        await book_service.get_all_books(page=1, size=2)
+    with count_queries(db_session) as large_page:
+        result = await book_service.get_all_books(page=1, size=20)
+    with count_queries(db_session) as cursor_page:
+        await book_service.get_books_by_cursor(size=20)
+    with count_queries(db_session) as single_book:
+        await book_service.get_book(result.items[0].id)
+
+    assert len(result.items) == 20
+    assert len(large_page) == len(small_page)
+    # One SELECT for the books, plus one for the authors with selectin
+    expected = 1 if author_loading == "joined" else 2
+    assert len(cursor_page) == expected
+    assert len(single_book) == expected
+
+
+@pytest.mark.asyncio
+async def test_get_all_books_count_strategies(
+    db_session, author_repository, author_service
+):
+    book_service = BookService(
+        BookRepository(db_session, TTLCache(maxsize=16, ttl=60)), author_repository
+    )
+    author = await author_service.create_author("Test Author")
+    await book_service.create_book("Book 1", "1234567890", author.id)
+
+    result = await book_service.get_all_books(count="none")
+    assert result.total is None
+    assert result.pages is None
+    assert result.count_type == "none"
+
+    # The first cached count is computed exactly, then served from the cache
+    result = await book_service.get_all_books(count="cached")
+    assert (result.total, result.count_type) == (1, "exact")
+    result = await book_service.get_all_books(count="cached")
+    assert (result.total, result.count_type) == (1, "cached")
+
+    # Writes invalidate the cached count
+    await book_service.create_book("Book 2", "0987654321", author.id)
+    result = await book_service.get_all_books(count="cached")
+    assert (result.total, result.count_type) == (2, "exact")
+
+    # Planner estimates are unavailable on a freshly created table
+    result = await book_service.get_all_books(count="estimated")
+    assert result.count_type in ("estimated", "exact")
+
+    with pytest.raises(Exception) as exc_info:
+        await book_service.get_all_books(count="bogus")
+    assert "Count must be one of" in str(exc_info.value)
+
+
+@pytest.mark.asyncio
+async def test_page_cache_never_serves_an_exact_count(
+    db_session, author_repository, author_service
+):
+    page_cache = SharedCache(
+        MemoryBackend(),
+        "book_pages",
+        ModelCodec(Tuple[List[Book], Optional[int], str]),
+        ttl=60,
+        versioned=True,
+    )
+    book_service = BookService(
+        BookRepository(db_session, page_cache=page_cache), author_repository
+    )
+    author = await author_service.create_author("Test Author")
+    await book_service.create_book("Book 1", "1234567890", author.id)
+
+    for _ in range(2):
+        result = await book_service.get_all_books(count="exact")
+        assert (result.total, result.count_type) == (1, "exact")
+    assert page_cache.stats()["hits"] + page_cache.stats()["misses"] == 0
+
+    # Without a count cache the total is computed exactly, then served cached
+    result = await book_service.get_all_books(count="cached")
+    assert (result.total, result.count_type) == (1, "exact")
+    result = await book_service.get_all_books(count="cached")
+    assert (result.total, result.count_type) == (1, "cached")
+    assert page_cache.stats()["hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_cursor(book_service, author_service):
+    # Create test data
+    author = await author_service.create_author("Test Author")
+    isbns = ["1234567890", "0987654321", "1111111111"]
+    for i, isbn in enumerate(isbns):
+        await book_service.create_book(f"Book {i}", isbn, author.id)
+
+    # Walk every page following next_cursor
+    first = await book_service.get_books_by_cursor(size=2)
+    assert isinstance(first, CursorPaginatedResponse)
+    assert [book.title for book in first.items] == ["Book 2", "Book 1"]
+    assert first.next_cursor is not None
+
+    second = await book_service.get_books_by_cursor(cursor=first.next_cursor, size=2)
+    assert [book.title for book in second.items] == ["Book 0"]
+    assert second.next_cursor is None
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_invalid_cursor(book_service):
+    with pytest.raises(Exception) as exc_info:
+        await book_service.get_books_by_cursor(cursor="not-a-cursor")
+    assert "Invalid cursor" in str(exc_info.value)
+
+
 @pytest.mark.asyncio
 async def test_get_book(book_service, author_service):
     # Create test data
-    author = author_service.create_author("Test Author")
+    author = await author_service.create_author("Test Author")
     created_book = await book_service.create_book("Test Book", "1234567890", author.id)
 
     # Retrieve the book
-    retrieved_book = book_service.get_book(created_book.id)
+    retrieved_book = await book_service.get_book(created_book.id)
     assert isinstance(retrieved_book, Book)
     assert retrieved_book.id == created_book.id
     assert retrieved_book.title == "Test Book"
 
 
-def test_get_nonexistent_book(book_service):
+@pytest.mark.asyncio
+async def test_get_book_if_none_match(book_service, author_service, book_repository):
+    author = await author_service.create_author("Test Author")
+    created_book = await book_service.create_book("Test Book", "1234567890", author.id)
+    etag = book_etag(created_book)
+
+    with pytest.raises(HTTPException) as exc_info:
+        await book_service.get_book(created_book.id, if_none_match=etag)
+    assert exc_info.value.status_code == 304
+    assert exc_info.value.headers["ETag"] == etag
+
+    # An update bumps the row version, so the old tag no longer matches
+    await book_repository.update_metadata(created_book.id, description="New")
+    book = await book_service.get_book(created_book.id, if_none_match=etag)
+    assert book.version == 2
+    assert book_etag(book) != etag
+
+
+@pytest.mark.asyncio
+async def test_get_all_books_if_none_match(book_service, author_service):
+    author = await author_service.create_author("Test Author")
+    await book_service.create_book("Test Book", "1234567890", author.id)
+
+    result = await book_service.get_all_books(page=1, size=10, count="exact")
+    etag = book_collection_etag(result.items, result.page, result.size, result.total)
+    with pytest.raises(HTTPException) as exc_info:
+        await book_service.get_all_books(
+            page=1, size=10, count="exact", if_none_match=etag
+        )
+    assert exc_info.value.status_code == 304
+
+    await book_service.create_book("Test Book 2", "1234567891", author.id)
+    result = await book_service.get_all_books(
+        page=1, size=10, count="exact", if_none_match=etag
+    )
+    assert result.total == 2
+
+
+@pytest.mark.asyncio
+async def test_get_nonexistent_book(book_service):
     with pytest.raises(Exception) as exc_info:
-        book_service.get_book(999)
+        await book_service.get_book(999)
     assert "Book not found" in str(exc_info.value)
 
 
@@ -179,3 +390,36 @@ async def test_get_books_by_author_from_google(
     mock_google_books_repository.get_books_by_author.assert_called_once_with(
         "Test Author", 10
     )
+
+
+@pytest.mark.asyncio
+async def test_search_books(book_service, author_service):
+    # Create test data
+    le_guin = await author_service.create_author("Ursula K. Le Guin")
+    herbert = await author_service.create_author("Frank Herbert")
+    await book_service.create_book(
+        "The Left Hand of Darkness", "1234567890", le_guin.id
+    )
+    await book_service.create_book("A Wizard of Earthsea", "0987654321", le_guin.id)
+    await book_service.create_book("Dune", "1111111111", herbert.id)
+
+    # Full-text match on the title
+    result = await book_service.search_books("darkness")
+    assert [book.title for book in result.items] == ["The Left Hand of Darkness"]
+    assert result.total == 1
+
+    # Fuzzy matches tolerate typos in titles and author names
+    result = await book_service.search_books("Wizzard of Earthse")
+    assert result.items[0].title == "A Wizard of Earthsea"
+    result = await book_service.search_books("Ursula Le Gwin", size=1)
+    assert result.total == 2
+    assert result.pages == 2
+    assert result.items[0].author.name == "Ursula K. Le Guin"
+    assert result.items[0].score > 0
+
+
+@pytest.mark.asyncio
+async def test_search_books_empty_query(book_service):
+    with pytest.raises(Exception) as exc_info:
+        await book_service.search_books("  ")
+    assert "Query must not be empty" in str(exc_info.value)
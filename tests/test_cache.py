@@ -0,0 +1,82 @@
+import asyncio
+import pytest
+from app.cache import TTLCache
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_get_and_set():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    assert cache.get("a") == 1
+    assert cache.get("b") is None
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["misses"] == 1
+
+
+def test_entries_expire_after_ttl():
+    clock = FakeClock()
+    cache = TTLCache(maxsize=2, ttl=10, clock=clock)
+    cache.set("a", 1)
+    clock.now = 9.9
+    assert cache.get("a") == 1
+    clock.now = 10.0
+    assert cache.get("a") is None
+    assert len(cache) == 0
+
+
+def test_least_recently_used_entry_is_evicted():
+    cache = TTLCache(maxsize=2, ttl=10)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    cache.get("a")
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.get("c") == 3
+    assert cache.stats()["evictions"] == 1
+
+
+@pytest.mark.asyncio
+async def test_concurrent_loads_are_coalesced():
+    cache = TTLCache(maxsize=10, ttl=10)
+    calls = 0
+
+    async def loader():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    results = await asyncio.gather(
+        *(cache.get_or_load("key", loader) for _ in range(200))
+    )
+
+    assert results == ["value"] * 200
+    assert calls == 1
+    assert cache.stats()["coalesced"] == 199
+    assert await cache.get_or_load("key", loader) == "value"
+    assert calls == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_loads_are_not_cached():
+    cache = TTLCache(maxsize=10, ttl=10)
+
+    async def failing_loader():
+        raise ValueError("upstream error")
+
+    with pytest.raises(ValueError):
+        await cache.get_or_load("key", failing_loader)
+
+    async def loader():
+        return "value"
+
+    assert await cache.get_or_load("key", loader) == "value"
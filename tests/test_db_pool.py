@@ -0,0 +1,59 @@
+import pytest
+from sqlalchemy import create_engine, exc, text
+from app.db_pool import ReplicaRouter, TimedNullPool, TimedQueuePool, pool_stats
+
+
+def test_queue_pool_reports_checkouts_and_waits():
+    engine = create_engine(
+        "sqlite://",
+        poolclass=TimedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 1
+        assert stats["size"] == 1
+
+        # The only connection is in use, so a second checkout times out
+        with pytest.raises(exc.TimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["checked_in"] == 1
+    assert stats["acquisitions"] == 2
+    assert stats["timeouts"] == 1
+    assert stats["wait_max_ms"] >= 10
+    engine.dispose()
+
+
+def test_null_pool_counts_checkouts():
+    engine = create_engine("sqlite://", poolclass=TimedNullPool)
+    with engine.connect():
+        assert pool_stats(engine.pool)["checked_out"] == 1
+    stats = pool_stats(engine.pool)
+    assert stats["pool"] == "TimedNullPool"
+    assert stats["checked_out"] == 0
+    assert "overflow" not in stats
+
+
+def test_replica_router_round_robin():
+    router = ReplicaRouter(["a", "b", "c"])
+    assert [router.choose() for _ in range(4)] == ["a", "b", "c", "a"]
+
+
+def test_replica_router_least_connections():
+    engines = [create_engine("sqlite://", poolclass=TimedQueuePool) for _ in range(2)]
+    router = ReplicaRouter(engines, "least_connections")
+
+    with engines[0].connect():
+        assert [router.choose() for _ in range(3)] == [engines[1]] * 3
+    # With the pools even again, reads alternate
+    assert {router.choose(), router.choose()} == set(engines)
+
+    for engine in engines:
+        engine.dispose()
@@ -0,0 +1,80 @@
+import httpx
+import pytest
+from contextlib import asynccontextmanager
+from unittest.mock import AsyncMock, MagicMock
+from app.schemas import GoogleBook
+from app.services.book_service import BookService
+from app.services.enrichment_service import EnrichmentService
+
+GOOGLE_BOOK = GoogleBook(
+    id="test_id_1",
+    title="Test Book 1",
+    authors=["Test Author 1"],
+    description="Test Description 1",
+    isbn="1234567890",
+    published_date="2023-01-01",
+    publisher="Test Publisher",
+)
+
+
+def session_factory_for(session):
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    return session_factory
+
+
+@pytest.mark.asyncio
+async def test_enrich_persists_metadata(db_session, author_repository, book_repository):
+    author = await author_repository.create("Test Author")
+    book = await book_repository.create("Test Book", "1234567890", author.id)
+
+    google_books_repository = MagicMock()
+    google_books_repository.get_book_by_isbn = AsyncMock(return_value=GOOGLE_BOOK)
+    service = EnrichmentService(
+        google_books_repository, session_factory_for(db_session)
+    )
+
+    assert await service.enrich(book.id, book.isbn)
+    enriched = await book_repository.get_by_id(book.id)
+    assert enriched.description == "Test Description 1"
+    assert enriched.publisher == "Test Publisher"
+    assert enriched.published_date == "2023-01-01"
+
+
+@pytest.mark.asyncio
+async def test_create_book_enqueues_enrichment(book_repository, author_repository):
+    enrichment_service = MagicMock()
+    book_service = BookService(
+        book_repository, author_repository, enrichment_service=enrichment_service
+    )
+    author = await author_repository.create("Test Author")
+
+    book = await book_service.create_book("Test Book", "1234567890", author.id)
+
+    enrichment_service.enqueue.assert_called_once_with(book.id, "1234567890")
+
+
+@pytest.mark.asyncio
+async def test_worker_retries_upstream_errors():
+    google_books_repository = MagicMock()
+    google_books_repository.get_book_by_isbn = AsyncMock(
+        side_effect=[httpx.ConnectError("down"), httpx.ConnectError("down"), None]
+    )
+    service = EnrichmentService(
+        google_books_repository, MagicMock(), concurrency=2, retry_delay=0
+    )
+    service.start()
+
+    assert service.enqueue(1, "1234567890")
+    await service.join()
+    await service.stop()
+
+    assert google_books_repository.get_book_by_isbn.await_count == 3
+
+
+def test_enqueue_drops_jobs_when_queue_is_full():
+    service = EnrichmentService(MagicMock(), MagicMock(), maxsize=1)
+    assert service.enqueue(1, "1234567890")
+    assert not service.enqueue(2, "0987654321")
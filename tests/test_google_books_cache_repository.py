@@ -0,0 +1,69 @@
+import httpx
+import pytest
+from contextlib import asynccontextmanager
+from app.repositories.google_books_cache_repository import GoogleBooksCacheRepository
+from app.repositories.google_books_repository import GoogleBook, GoogleBooksRepository
+
+GOOGLE_BOOK = GoogleBook(
+    id="test_id_1",
+    title="Test Book 1",
+    authors=["Test Author 1"],
+    description="Test Description 1",
+    isbn="9781234567890",
+    published_date="2023-01-01",
+    publisher="Test Publisher",
+)
+
+
+def session_factory_for(session):
+    @asynccontextmanager
+    async def session_factory():
+        yield session
+
+    return session_factory
+
+
+@pytest.mark.asyncio
+async def test_stores_found_and_missing_isbns(db_session):
+    isbn_cache = GoogleBooksCacheRepository(session_factory_for(db_session))
+    await isbn_cache.set_many({"9781234567890": GOOGLE_BOOK, "9780000000000": None})
+
+    stored = await isbn_cache.get_many(["9781234567890", "9780000000000", "1"])
+    assert stored == {"9781234567890": GOOGLE_BOOK, "9780000000000": None}
+
+    # Writing again refreshes the entry in place
+    await isbn_cache.set_many({"9780000000000": GOOGLE_BOOK})
+    stored = await isbn_cache.get_many(["9780000000000"])
+    assert stored["9780000000000"].id == "test_id_1"
+
+
+@pytest.mark.asyncio
+async def test_expired_entries_are_treated_as_missing(db_session):
+    isbn_cache = GoogleBooksCacheRepository(session_factory_for(db_session), ttl=-1)
+    await isbn_cache.set_many({"9781234567890": GOOGLE_BOOK})
+
+    assert await isbn_cache.get_many(["9781234567890"]) == {}
+
+
+@pytest.mark.asyncio
+async def test_isbn_lookups_read_through_the_persistent_cache(db_session):
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"items": []})
+
+    isbn_cache = GoogleBooksCacheRepository(session_factory_for(db_session))
+    await isbn_cache.set_many({"9781234567890": GOOGLE_BOOK})
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    repository = GoogleBooksRepository("test_api_key", client, isbn_cache=isbn_cache)
+
+    assert await repository.get_book_by_isbn("978-1234567890") == GOOGLE_BOOK
+    assert calls == 0
+
+    # A miss goes to Google once; the (empty) answer is then shared as well
+    assert await repository.get_book_by_isbn("9780000000000") is None
+    assert await repository.get_book_by_isbn("9780000000000") is None
+    assert calls == 1
+    assert await isbn_cache.get_many(["9780000000000"]) == {"9780000000000": None}
@@ -0,0 +1,265 @@
+import asyncio
+import httpx
+import pytest
+from app.cache import TTLCache
+from typing import List
+from app.repositories.google_books_repository import GoogleBook, GoogleBooksRepository
+from app.shared_cache import MemoryBackend, ModelCodec, SharedCache
+from app.resilience import CircuitBreaker, CircuitOpenError, DeadlineExceededError
+
+MOCK_VOLUME = {
+    "id": "test_id_1",
+    "volumeInfo": {
+        "title": "Test Book 1",
+        "authors": ["Test Author 1"],
+        "industryIdentifiers": [{"type": "ISBN_13", "identifier": "9781234567890"}],
+    },
+}
+
+
+def make_repository(handler, cache=None):
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    return GoogleBooksRepository("test_api_key", client, cache)
+
+
+@pytest.mark.asyncio
+async def test_search_books_parses_volumes():
+    def handler(request):
+        assert request.url.params["q"] == "isbn:9781234567890"
+        return httpx.Response(200, json={"items": [MOCK_VOLUME]})
+
+    repository = make_repository(handler)
+    book = await repository.get_book_by_isbn("9781234567890")
+
+    assert book.id == "test_id_1"
+    assert book.isbn == "9781234567890"
+
+
+@pytest.mark.asyncio
+async def test_identical_concurrent_searches_make_one_upstream_call():
+    calls = 0
+
+    async def handler(request):
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return httpx.Response(200, json={"items": [MOCK_VOLUME]})
+
+    cache = TTLCache(maxsize=10, ttl=60)
+    repository = make_repository(handler, cache)
+    results = await asyncio.gather(
+        *(repository.search_books("python", 10) for _ in range(200))
+    )
+
+    assert calls == 1
+    assert all(books[0].id == "test_id_1" for books in results)
+
+    # Different max_results is a different cache key
+    await repository.search_books("python", 5)
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_shared_cache_serves_searches_made_by_other_workers():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        return httpx.Response(200, json={"items": [MOCK_VOLUME]})
+
+    shared = SharedCache(
+        MemoryBackend(), "google_books", ModelCodec(List[GoogleBook]), ttl=60
+    )
+    # Each worker has its own in-process cache in front of the shared one
+    workers = [make_repository(handler, TTLCache(maxsize=10, ttl=60)) for _ in range(2)]
+    for repository in workers:
+        repository.shared_cache = shared
+
+    first = await workers[0].search_books("python", 10)
+    second = await workers[1].search_books("python", 10)
+
+    assert calls == 1
+    assert second == first
+
+
+def make_volume(volume_id, isbn_10, isbn_13):
+    return {
+        "id": volume_id,
+        "volumeInfo": {
+            "title": f"Title {volume_id}",
+            "industryIdentifiers": [
+                {"type": "ISBN_10", "identifier": isbn_10},
+                {"type": "ISBN_13", "identifier": isbn_13},
+            ],
+        },
+    }
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_isbns_deduplicates_and_bounds_concurrency():
+    in_flight = 0
+    max_in_flight = 0
+    queries = []
+
+    async def handler(request):
+        nonlocal in_flight, max_in_flight
+        query = request.url.params["q"]
+        queries.append(query)
+        in_flight += 1
+        max_in_flight = max(max_in_flight, in_flight)
+        await asyncio.sleep(0.01)
+        in_flight -= 1
+        if query == "isbn:0000000000":
+            return httpx.Response(200, json={})
+        isbn = query.removeprefix("isbn:")
+        return httpx.Response(
+            200, json={"items": [make_volume(isbn, isbn, "978" + isbn)]}
+        )
+
+    repository = make_repository(handler)
+    isbns = [f"{i:010d}" for i in range(10)] + ["000-000-0001", "0000000001"]
+    books = await repository.get_books_by_isbns(isbns, max_concurrency=3)
+
+    assert len(queries) == 10
+    assert max_in_flight == 3
+    assert books["0000000000"] is None
+    assert books["0000000001"].id == "0000000001"
+    assert books["000-000-0001"].id == "0000000001"
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_isbns_combines_queries():
+    queries = []
+
+    def handler(request):
+        queries.append(request.url.params["q"])
+        # Volumes come back in any order and may be found by either ISBN form
+        return httpx.Response(
+            200,
+            json={
+                "items": [
+                    make_volume("b", "0987654321", "9780987654321"),
+                    make_volume("a", "1234567890", "9781234567890"),
+                ]
+            },
+        )
+
+    cache = TTLCache(maxsize=10, ttl=60)
+    repository = make_repository(handler, cache)
+    books = await repository.get_books_by_isbns(
+        ["1234567890", "9780987654321", "1111111111"], isbns_per_query=5
+    )
+
+    assert queries == ["isbn:1234567890 OR isbn:9780987654321 OR isbn:1111111111"]
+    assert books["1234567890"].id == "a"
+    assert books["9780987654321"].id == "b"
+    assert books["1111111111"] is None
+
+    # The combined lookup seeded the per-ISBN cache
+    assert (await repository.get_book_by_isbn("1234567890")).id == "a"
+    assert await repository.get_book_by_isbn("1111111111") is None
+    assert len(queries) == 1
+
+
+@pytest.mark.asyncio
+async def test_get_books_by_isbns_keeps_results_when_one_isbn_fails():
+    def handler(request):
+        isbn = request.url.params["q"].removeprefix("isbn:")
+        if isbn == "0000000002":
+            return httpx.Response(503)
+        return httpx.Response(
+            200, json={"items": [make_volume(isbn, isbn, "978" + isbn)]}
+        )
+
+    class IsbnCache:
+        def __init__(self):
+            self.stored = {}
+
+        async def get_many(self, isbns):
+            return {}
+
+        async def set_many(self, books):
+            self.stored.update(books)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    isbn_cache = IsbnCache()
+    repository = GoogleBooksRepository("test_api_key", client, isbn_cache=isbn_cache)
+    isbns = ["0000000001", "0000000002", "0000000003"]
+    books = await repository.get_books_by_isbns(isbns)
+
+    assert books["0000000001"].id == "0000000001"
+    assert books["0000000002"] is None
+    assert books["0000000003"].id == "0000000003"
+    # The failure is not remembered as "no such book"
+    assert sorted(isbn_cache.stored) == ["0000000001", "0000000003"]
+    with pytest.raises(httpx.HTTPStatusError):
+        await repository.get_book_by_isbn("0000000002")
+
+
+@pytest.mark.asyncio
+async def test_retries_throttled_and_failed_responses(monkeypatch):
+    monkeypatch.setattr(
+        "app.repositories.google_books_repository.backoff_delay", lambda attempt: 0
+    )
+    responses = [
+        httpx.Response(429, headers={"Retry-After": "0"}),
+        httpx.Response(503),
+        httpx.Response(200, json={"items": [MOCK_VOLUME]}),
+    ]
+
+    def handler(request):
+        return responses.pop(0)
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    repository = GoogleBooksRepository("test_api_key", client, max_retries=2)
+    books = await repository.search_books("python")
+
+    assert books[0].id == "test_id_1"
+    assert responses == []
+
+
+@pytest.mark.asyncio
+async def test_open_circuit_fails_fast_and_serves_stale_results():
+    calls = 0
+
+    def handler(request):
+        nonlocal calls
+        calls += 1
+        if calls == 1:
+            return httpx.Response(200, json={"items": [MOCK_VOLUME]})
+        return httpx.Response(500)
+
+    clock = [0.0]
+    cache = TTLCache(maxsize=10, ttl=60, clock=lambda: clock[0], stale_ttl=600)
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=30)
+    repository = GoogleBooksRepository(
+        "test_api_key", client, cache, circuit_breaker=breaker
+    )
+
+    await repository.search_books("python")
+    clock[0] = 120
+
+    # The upstream failure trips the breaker, but the expired entry is served
+    books = await repository.search_books("python")
+    assert books[0].id == "test_id_1"
+    assert breaker.state == CircuitBreaker.OPEN
+
+    # While open, nothing reaches upstream
+    with pytest.raises(CircuitOpenError):
+        await repository.search_books("rust")
+    assert calls == 2
+
+
+@pytest.mark.asyncio
+async def test_deadline_bounds_slow_upstream_calls():
+    async def handler(request):
+        await asyncio.sleep(1)
+        return httpx.Response(200, json={"items": []})
+
+    client = httpx.AsyncClient(transport=httpx.MockTransport(handler))
+    repository = GoogleBooksRepository("test_api_key", client, deadline=0.05)
+
+    with pytest.raises(DeadlineExceededError):
+        await repository.search_books("python")
@@ -0,0 +1,151 @@
+import asyncio
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+from unittest.mock import AsyncMock
+from app.loader import DataLoader
+from app.repositories.author_repository import AuthorRepository
+from app.repositories.book_repository import BookRepository
+from app.schemas import Author, Book
+from app.shared_cache import MemoryBackend, ModelCodec, SharedCache
+
+
+def make_loader():
+    calls = []
+
+    async def batch_load(keys):
+        calls.append(list(keys))
+        return {key: key * 10 for key in keys if key > 0}
+
+    return DataLoader(batch_load), calls
+
+
+@pytest.mark.asyncio
+async def test_loads_in_the_same_tick_share_one_batch():
+    loader, calls = make_loader()
+
+    values = await asyncio.gather(loader.load(1), loader.load(2), loader.load(1))
+
+    assert values == [10, 20, 10]
+    assert calls == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_results_are_memoized_until_cleared():
+    loader, calls = make_loader()
+
+    assert await loader.load_many([1, -1]) == [10, None]
+    assert await loader.load(1) == 10
+    assert await loader.load(-1) is None
+    assert calls == [[1, -1]]
+
+    loader.clear(1)
+    assert await loader.load(1) == 10
+    assert calls == [[1, -1], [1]]
+
+
+@pytest.mark.asyncio
+async def test_failures_are_not_memoized():
+    attempts = 0
+
+    async def batch_load(keys):
+        nonlocal attempts
+        attempts += 1
+        if attempts == 1:
+            raise RuntimeError("boom")
+        return {key: key for key in keys}
+
+    loader = DataLoader(batch_load)
+    with pytest.raises(RuntimeError):
+        await loader.load(1)
+    assert await loader.load(1) == 1
+
+
+@pytest.mark.asyncio
+async def test_repository_lookups_are_batched(db_session, author_repository):
+    authors = [await author_repository.create(f"Author {i}") for i in range(3)]
+
+    # A fresh repository, as a new request would get
+    repository = AuthorRepository(db_session)
+    found = await asyncio.gather(
+        *(repository.get_by_id(author.id) for author in authors),
+        repository.get_by_id(999),
+    )
+
+    assert [author.name for author in found[:3]] == ["Author 0", "Author 1", "Author 2"]
+    assert found[3] is None
+    assert repository._loader.batches == 1
+
+
+@pytest.mark.asyncio
+async def test_loaders_sharing_a_session_take_turns(db_session, author_repository):
+    author = await author_repository.create("Author")
+    book = await BookRepository(db_session).create("Book", "1234567890", author.id)
+    db_session.expunge_all()
+
+    # Two repositories of one request, each batching in a task of its own
+    books = BookRepository(db_session, author_loading="selectin")
+    authors = AuthorRepository(db_session)
+    in_flight = max_in_flight = 0
+
+    def track(repository):
+        get_by_ids = repository._get_by_ids
+
+        async def tracked(session, ids):
+            nonlocal in_flight, max_in_flight
+            in_flight += 1
+            max_in_flight = max(max_in_flight, in_flight)
+            await asyncio.sleep(0.01)
+            try:
+                return await get_by_ids(session, ids)
+            finally:
+                in_flight -= 1
+
+        repository._get_by_ids = tracked
+
+    track(books)
+    track(authors)
+    found_book, found_author = await asyncio.gather(
+        books.get_by_id(book.id), authors.get_by_id(author.id)
+    )
+
+    assert (found_book.title, found_author.name) == ("Book", "Author")
+    assert max_in_flight == 1
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_is_filled_from_the_primary(db_session, author_repository):
+    author = await author_repository.create("Cached Author")
+    cache = SharedCache(MemoryBackend(), "authors", ModelCodec(Author), ttl=60)
+    # A replica that may lag behind the write above
+    replica = AsyncMock(spec=AsyncSession)
+
+    repository = AuthorRepository(db_session, read_db=replica, entity_cache=cache)
+    assert (await repository.get_by_id(author.id)).name == "Cached Author"
+
+    replica.execute.assert_not_awaited()
+    assert (await cache.get(author.id)).name == "Cached Author"
+
+
+@pytest.mark.asyncio
+async def test_entity_cache_is_shared_across_requests(
+    db_session, author_repository, book_repository
+):
+    author = await author_repository.create("Cached Author")
+    book = await book_repository.create("Cached Book", "1234567890", author.id)
+    cache = SharedCache(MemoryBackend(), "books", ModelCodec(Book), ttl=60)
+
+    first = BookRepository(db_session, entity_cache=cache)
+    assert (await first.get_by_id(book.id)).title == "Cached Book"
+    assert first._loader.batches == 1
+
+    # A cached book comes back as its schema
+    second = BookRepository(db_session, entity_cache=cache)
+    cached = await second.get_by_id(book.id)
+    assert isinstance(cached, Book)
+    assert cached.author.name == "Cached Author"
+    assert cache.stats()["hits"] == 1
+
+    await second.update_metadata(book.id, description="Updated")
+    assert await cache.get(book.id) is None
+    third = BookRepository(db_session, entity_cache=cache)
+    assert (await third.get_by_id(book.id)).description == "Updated"
@@ -0,0 +1,61 @@
+import httpx
+import pytest
+from fastapi import FastAPI
+from app.metrics import Counter, Histogram, record_phase, render_gauge
+from app import middleware
+from app.middleware import MetricsMiddleware
+
+
+def test_histogram_renders_cumulative_buckets():
+    histogram = Histogram("latency_seconds", "Latency", ("route",), (0.1, 1))
+
+    histogram.observe(0.05, "/books/")
+    histogram.observe(0.5, "/books/")
+    histogram.observe(5, "/books/")
+
+    lines = histogram.collect()
+    assert 'latency_seconds_bucket{route="/books/",le="0.1"} 1' in lines
+    assert 'latency_seconds_bucket{route="/books/",le="1"} 2' in lines
+    assert 'latency_seconds_bucket{route="/books/",le="+Inf"} 3' in lines
+    assert 'latency_seconds_count{route="/books/"} 3' in lines
+
+
+def test_counter_and_gauge_render_labels():
+    counter = Counter("requests_total", "Requests", ("status",))
+    counter.inc(200)
+    counter.inc(200)
+
+    assert 'requests_total{status="200"} 2' in counter.collect()
+    assert 'pool_size{engine="async"} 5' in render_gauge(
+        "pool_size", "Pool size", ("engine",), [(("async",), 5)]
+    )
+    assert "# TYPE timeouts_total counter" in render_gauge(
+        "timeouts_total", "Timeouts", (), [((), 1)], kind="counter"
+    )
+
+
+@pytest.mark.asyncio
+async def test_middleware_labels_requests_by_route_template(monkeypatch, caplog):
+    app = FastAPI()
+    app.add_middleware(MetricsMiddleware, slow_request_threshold=0)
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        record_phase("sql", 0.002)
+        return {"id": item_id}
+
+    requests = Counter("requests_total", "Requests", ("method", "route", "status"))
+    monkeypatch.setattr(middleware, "HTTP_REQUESTS", requests)
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+        await client.get("/items/1")
+        await client.get("/missing")
+
+    lines = requests.collect()
+    assert (
+        'requests_total{method="GET",route="/items/{item_id}",status="200"} 1' in lines
+    )
+    assert 'requests_total{method="GET",route="unmatched",status="404"} 1' in lines
+    assert "Slow request GET /items/1 -> 200" in caplog.text
+    assert "sql 2.0ms (1 queries)" in caplog.text
@@ -0,0 +1,73 @@
+import asyncio
+import pytest
+from app.resilience import CircuitBreaker, CircuitOpenError, TokenBucket
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_token_bucket_allows_bursts_then_refills():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2, capacity=3, clock=clock)
+
+    assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+    clock.now = 0.5
+    assert bucket.try_acquire()
+    assert not bucket.try_acquire()
+
+
+@pytest.mark.asyncio
+async def test_token_bucket_acquire_waits_for_a_token():
+    bucket = TokenBucket(rate=100, capacity=1)
+    await bucket.acquire()
+    await asyncio.wait_for(bucket.acquire(), timeout=1)
+    assert bucket.stats()["waits"] >= 1
+
+
+def test_circuit_breaker_opens_after_consecutive_failures():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=10, clock=clock)
+
+    breaker.before_call()
+    breaker.record_failure()
+    breaker.before_call()
+    breaker.record_success()
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+
+    breaker.before_call()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+
+def test_circuit_breaker_half_open_allows_one_trial():
+    clock = FakeClock()
+    breaker = CircuitBreaker(failure_threshold=1, reset_timeout=10, clock=clock)
+    breaker.before_call()
+    breaker.record_failure()
+
+    clock.now = 10
+    breaker.before_call()
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    # A failed trial re-opens the circuit for another reset_timeout
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    clock.now = 15
+    with pytest.raises(CircuitOpenError):
+        breaker.before_call()
+
+    clock.now = 20
+    breaker.before_call()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
@@ -0,0 +1,134 @@
+import asyncio
+from typing import List
+import pytest
+from app.schemas import Author
+from app.shared_cache import MemoryBackend, ModelCodec, RedisBackend, SharedCache
+
+
+@pytest.fixture(params=["memory", "redis"])
+async def backend(request, redis_server):
+    if request.param == "memory":
+        yield MemoryBackend()
+        return
+    backend = RedisBackend(redis_server.url)
+    yield backend
+    await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_values_round_trip_through_the_codec(backend):
+    cache = SharedCache(backend, "authors", ModelCodec(Author), ttl=60)
+
+    await cache.set_many(
+        {1: Author(id=1, name="One"), 2: Author(id=2, name="Two", bio="Bio")}
+    )
+
+    found = await cache.get_many([1, 2, 3])
+    assert found == {
+        1: Author(id=1, name="One"),
+        2: Author(id=2, name="Two", bio="Bio"),
+    }
+    assert cache.stats()["hit_ratio"] == 0.667
+
+    await cache.delete(1)
+    assert await cache.get(1) is None
+
+
+@pytest.mark.asyncio
+async def test_entries_expire(backend):
+    cache = SharedCache(backend, "words", ModelCodec(List[str]), ttl=0.05)
+    await cache.set("key", ["a", "b"])
+    assert await cache.get("key") == ["a", "b"]
+
+    await asyncio.sleep(0.1)
+    assert await cache.get("key") is None
+
+
+@pytest.mark.asyncio
+async def test_clear_drops_a_versioned_namespace(backend):
+    pages = SharedCache(backend, "pages", ModelCodec(int), ttl=60, versioned=True)
+    other = SharedCache(backend, "other", ModelCodec(int), ttl=60)
+    await pages.set_many({1: 10, 2: 20})
+    await other.set(1, 10)
+
+    await pages.clear()
+
+    assert await pages.get_many([1, 2]) == {}
+    assert await other.get(1) == 10
+
+
+@pytest.mark.asyncio
+async def test_value_loaded_across_a_clear_is_not_served(backend):
+    pages = SharedCache(backend, "pages", ModelCodec(int), ttl=60, versioned=True)
+
+    async def load():
+        # A write clears the namespace after the miss, before the store
+        await pages.clear()
+        return 1
+
+    assert await pages.get_or_load("page", load) == 1
+    assert await pages.get("page") is None
+
+    assert await pages.get_or_load("page", lambda: asyncio.sleep(0, 2)) == 2
+    assert await pages.get("page") == 2
+
+
+@pytest.mark.asyncio
+async def test_get_many_or_load_loads_only_misses(backend):
+    cache = SharedCache(backend, "numbers", ModelCodec(str), ttl=60)
+    await cache.set(1, "one")
+    calls = []
+
+    async def load_many(keys):
+        calls.append(keys)
+        return {key: str(key) for key in keys if key > 0}
+
+    assert await cache.get_many_or_load([1, 2, -1], load_many) == {1: "one", 2: "2"}
+    # Keys that were not found are not cached
+    assert await cache.get_many_or_load([2, -1], load_many) == {2: "2"}
+    assert calls == [[2, -1], [-1]]
+
+
+@pytest.mark.asyncio
+async def test_unavailable_redis_is_a_miss(redis_server):
+    url = redis_server.url
+    await redis_server.stop()
+
+    cache = SharedCache(
+        RedisBackend(url, timeout=0.5), "authors", ModelCodec(Author), 60
+    )
+    await cache.set(1, Author(id=1, name="One"))
+    assert await cache.get(1) is None
+    assert cache.stats()["errors"] == 2
+
+
+@pytest.mark.asyncio
+async def test_cancelled_command_drops_its_connection():
+    async def never_reply(reader, writer):
+        await reader.read()
+        writer.close()
+
+    server = await asyncio.start_server(never_reply, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    backend = RedisBackend(f"redis://127.0.0.1:{port}/0", timeout=5)
+    connections = []
+    connect = backend._connect
+
+    async def record_connect():
+        connections.append(await connect())
+        return connections[-1]
+
+    backend._connect = record_connect
+
+    task = asyncio.create_task(backend.get_many(["key"]))
+    await asyncio.sleep(0.05)
+    task.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await task
+
+    # Half-way through a reply, the connection is closed rather than reused
+    [(_, writer)] = connections
+    assert writer.is_closing()
+    assert backend._idle == []
+    server.close()
+    await server.wait_closed()